@@ -1,7 +1,9 @@
 """The core math and functionality behind the calibration algorithm."""
 
-from typing import NamedTuple
+import itertools
+from typing import Any, NamedTuple
 import numpy as np
+from numpy.typing import NDArray
 
 
 class Point(NamedTuple):
@@ -29,8 +31,8 @@ class Calibration:
         self._points = points
 
         # Default values, to be overwritten by _fit_coefficients() function.
-        self._x_coeff = np.zeros((self.x_order + 1) * (self.y_order + 1))
-        self._y_coeff = np.zeros((self.x_order + 1) * (self.y_order + 1))
+        self._x_coeff: NDArray[np.floating[Any]] = np.zeros((self.x_order + 1) * (self.y_order + 1))
+        self._y_coeff: NDArray[np.floating[Any]] = np.zeros((self.x_order + 1) * (self.y_order + 1))
 
         # Validate the polynomial orders and fit the coefficients
         self._fit_coefficients()
@@ -80,37 +82,28 @@ class Calibration:
 
     def map(self, point: Point) -> Point:
         """Map from expected coordinates to actual (calibrated) coordinates."""
-        x_calibrated = 0.0
-        y_calibrated = 0.0
-        index = 0
-        for n_x in range(self.x_order + 1):
-            for n_y in range(self.y_order + 1):
-                x_calibrated += self._x_coeff[index].item() * point.x**n_x * point.y**n_y
-                y_calibrated += self._y_coeff[index].item() * point.x**n_x * point.y**n_y
-                index += 1
+        # Both axes use the same terms, so only calculate them once
+        xy_row = self._make_xy_row(point.x, point.y)
+        x_calibrated = float(np.dot(xy_row, self._x_coeff))
+        y_calibrated = float(np.dot(xy_row, self._y_coeff))
         return Point(x_calibrated, y_calibrated)
 
     def _fit_coefficients(self) -> None:
         """Fit the actual points to calculate the coefficients for equations for x and y."""
         self._check_orders()
 
-        temp_xy_matrix = []
-        temp_x_actual = []
-        temp_y_actual = []
-        for n_x in range(self.x_count):
-            for n_y in range(self.y_count):
-                point_pair = self.points[n_x][n_y]
-                temp_xy_matrix.append(
-                    self._make_xy_row(point_pair.expected.x, point_pair.expected.y)
-                )
-                temp_x_actual.append(point_pair.actual.x)
-                temp_y_actual.append(point_pair.actual.y)
-        xy_matrix = np.matrix(temp_xy_matrix)
-        x_actual = np.matrix(temp_x_actual).T
-        y_actual = np.matrix(temp_y_actual).T
-
-        self._x_coeff = np.linalg.inv(xy_matrix.T * xy_matrix) * xy_matrix.T * x_actual
-        self._y_coeff = np.linalg.inv(xy_matrix.T * xy_matrix) * xy_matrix.T * y_actual
+        # Fill the matrices in place, rather than building lists and copying them into arrays
+        num_points = self.x_count * self.y_count
+        xy_matrix = np.empty((num_points, (self.x_order + 1) * (self.y_order + 1)))
+        actual = np.empty((num_points, 2))
+        for index, point_pair in enumerate(itertools.chain.from_iterable(self.points)):
+            xy_matrix[index] = self._make_xy_row(point_pair.expected.x, point_pair.expected.y)
+            actual[index] = point_pair.actual
+
+        # Solve the least-square normal equations for both axes at once
+        coeffs = np.linalg.solve(xy_matrix.T @ xy_matrix, xy_matrix.T @ actual)
+        self._x_coeff = coeffs[:, 0]
+        self._y_coeff = coeffs[:, 1]
 
     def _make_xy_row(self, x_i: float, y_i: float) -> list[float]:
         """Make one row of the xy matrix."""
@@ -1,11 +1,15 @@
 """Microscope Autofocus with Python and OpenCV."""
 
 import argparse
+import functools
 import math
+from collections.abc import Callable
 from typing import Any
 
 import cv2
 from matplotlib import pyplot as plt
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
 from simple_pyspin import Camera  # type: ignore
 from zaber_motion.ascii import Connection
 from zaber_motion.units import Units
@@ -34,6 +38,18 @@ def figure_file_name(position: float) -> str:
     return f"at_{position_mm}_{position_frac}.png"
 
 
+@functools.cache
+def get_step_figure() -> tuple[Figure, tuple[Axes, Axes, Axes]]:
+    """
+    Create the figure used to plot each step and return it with its three axes.
+
+    The figure is created on the first call and reused afterwards,
+    as creating a new figure for every step is slow.
+    """
+    fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(10, 2))
+    return fig, (ax1, ax2, ax3)
+
+
 def calculate_focus_score(image: Any, blur: int, position: float) -> float:
     """
     Calculate a score representing how well the image is focussed.
@@ -42,6 +58,10 @@ def calculate_focus_score(image: Any, blur: int, position: float) -> float:
     :param blur: The blur to apply.
     :param position: The position in mm the image was captured at.
     """
+    if image.dtype == "uint16":
+        # medianBlur only accepts 8 bit images for blur larger than 5, and is much faster on them.
+        # Keeping the most significant byte loses detail that doesn't matter for scoring focus.
+        image = cv2.convertScaleAbs(image, alpha=1 / 256)
     image_filtered = cv2.medianBlur(image, blur)
     laplacian = cv2.Laplacian(image_filtered, cv2.CV_64F)
     focus_score: float = laplacian.var()
@@ -49,34 +69,95 @@ def calculate_focus_score(image: Any, blur: int, position: float) -> float:
     if SHOW_STEP_IMAGES:
         focus_scores.append(focus_score)
         grayscale_laplacian = cv2.convertScaleAbs(laplacian, alpha=50)
-        fig = plt.figure(figsize=(10, 2))
+        fig, (ax1, ax2, ax3) = get_step_figure()
+        for axis in (ax1, ax2, ax3):
+            axis.clear()
 
-        ax1 = fig.add_subplot(131)
         ax1.imshow(image_filtered)
         ax1.set_title("Filtered")
-        ax1.set_xticks([])
-        ax1.set_yticks([])
 
-        ax2 = fig.add_subplot(132)
         ax2.imshow(grayscale_laplacian)
         ax2.set_title("Laplacian")
-        ax2.set_xticks([])
-        ax2.set_yticks([])
 
-        ax3 = fig.add_subplot(133)
         ax3.plot(range(len(focus_scores)), focus_scores, color="red")
         ax3.set_title("Variance")
-        ax3.set_xticks([])
-        ax3.set_yticks([])
 
-        plt.savefig(figure_file_name(position))
-        plt.close()
+        for axis in (ax1, ax2, ax3):
+            axis.set_xticks([])
+            axis.set_yticks([])
+
+        fig.savefig(figure_file_name(position))
 
     return focus_score
 
 
-def find_best_focus(
-    start_mm: float, end_mm: float, step_size_mm: float, microscope_serial_port: str, blur: int
+def sweep_search(
+    measure: Callable[[float], float], start_mm: float, end_mm: float, step_size_mm: float
+) -> tuple[float, float]:
+    """
+    Measure the focus score at every step in the range and return the best position and score.
+
+    :param measure: Moves to a position in mm and returns the focus score there.
+    :param start_mm: The position, in mm, to start at.
+    :param end_mm: The position, in mm, to end at.
+    :param step_size_mm: The distance, in mm, to move between taking images with the camera.
+    """
+    best_focus_score = 0.0
+    best_focus_position = 0.0
+    # How many steps to take to achieve the desired step size, +1 to check end_mm
+    steps = math.ceil((end_mm - start_mm) / step_size_mm) + 1
+    for step in range(0, steps):
+        position = min(start_mm + step * step_size_mm, end_mm)
+        focus_score = measure(position)
+        if focus_score > best_focus_score:
+            best_focus_position = position
+            best_focus_score = focus_score
+    return best_focus_position, best_focus_score
+
+
+def golden_section_search(
+    measure: Callable[[float], float], start_mm: float, end_mm: float, step_size_mm: float
+) -> tuple[float, float]:
+    """
+    Narrow in on the best focus with a golden-section search and return its position and score.
+
+    The focus score must have a single peak in the range for this to find the best focus.
+    Each iteration shrinks the range by the golden ratio and only needs one new image,
+    so far fewer images are taken than with a sweep at the same resolution.
+
+    :param measure: Moves to a position in mm and returns the focus score there.
+    :param start_mm: The position, in mm, to start at.
+    :param end_mm: The position, in mm, to end at.
+    :param step_size_mm: The search stops once the range is narrower than this distance, in mm.
+    """
+    low, high = start_mm, end_mm
+    lower = high - GOLDEN_RATIO * (high - low)
+    upper = low + GOLDEN_RATIO * (high - low)
+    lower_score = measure(lower)
+    upper_score = measure(upper)
+    while high - low > step_size_mm:
+        if lower_score > upper_score:
+            high, upper, upper_score = upper, lower, lower_score
+            lower = high - GOLDEN_RATIO * (high - low)
+            lower_score = measure(lower)
+        else:
+            low, lower, lower_score = lower, upper, upper_score
+            upper = low + GOLDEN_RATIO * (high - low)
+            upper_score = measure(upper)
+
+    if lower_score > upper_score:
+        return lower, lower_score
+    return upper, upper_score
+
+
+def find_best_focus(  # pylint: disable=too-many-arguments
+    start_mm: float,
+    end_mm: float,
+    step_size_mm: float,
+    microscope_serial_port: str,
+    blur: int,
+    *,
+    adaptive: bool = False,
 ) -> None:
     """
     Find best focus by changing the focal distance and taking images with the camera.
@@ -86,6 +167,7 @@ def find_best_focus(
     :param step_size_mm: The distance, in mm, to move between taking images with the camera.
     :param microscope_serial_port: The name of the serial port connected to the microscope.
     :param blur: The blur to apply to images during processing.
+    :param adaptive: Use a golden-section search instead of sweeping through every step.
     """
     # pylint: disable=too-many-locals
     with Connection.open_serial_port(microscope_serial_port) as connection, Camera() as cam:
@@ -99,20 +181,17 @@ def find_best_focus(
         # Set the camera to take individual shots
         cam.AcquisitionMode = "SingleFrame"
 
-        best_focus_score = 0.0
-        best_focus_position = 0.0
-        # How many steps to take to achieve the desired step size, +1 to check end_mm
-        steps = math.ceil((end_mm - start_mm) / step_size_mm) + 1
-        for step in range(0, steps):
-            position = min(start_mm + step * step_size_mm, end_mm)
+        def measure(position: float) -> float:
+            """Move to the position, capture an image and return its focus score."""
             z_axis.move_absolute(position, Units.LENGTH_MILLIMETRES)
             image = get_image(cam)
             focus_score = calculate_focus_score(image, blur, position)
-            if focus_score > best_focus_score:
-                best_focus_position = position
-                best_focus_score = focus_score
             if SHOW_STEP_INFO:
                 print(f"focus {position}: {focus_score}")
+            return focus_score
+
+        search = golden_section_search if adaptive else sweep_search
+        best_focus_position, best_focus_score = search(measure, start_mm, end_mm, step_size_mm)
 
         z_axis.move_absolute(best_focus_position, Units.LENGTH_MILLIMETRES)
         best_image = get_image(cam)
@@ -127,6 +206,9 @@ def find_best_focus(
 SHOW_STEP_INFO = False
 SHOW_STEP_IMAGES = False
 
+# Fraction of the range kept by each golden-section search iteration
+GOLDEN_RATIO = (math.sqrt(5) - 1) / 2
+
 focus_scores: list[float] = []
 
 if __name__ == "__main__":
@@ -160,6 +242,11 @@ if __name__ == "__main__":
         action="store_true",
         help="Show captured images for debugging. Should be used for at most ~10 steps.",
     )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Use a golden-section search, which takes fewer images but needs a single focus peak",
+    )
     parser.add_argument(
         "--blur",
         "-b",
@@ -179,4 +266,6 @@ if __name__ == "__main__":
             f"Bad value for blur, {args.blur} is not an odd number (required for median blurring)"
         )
 
-    find_best_focus(args.start, args.end, args.step, args.serial_port, args.blur)
+    find_best_focus(
+        args.start, args.end, args.step, args.serial_port, args.blur, adaptive=args.adaptive
+    )
@@ -17,11 +17,12 @@ For more information see README.md
 # Code adapted from:
 # https://math.stackexchange.com/questions/99299/best-fitting-plane-given-a-set-of-points
 
+import functools
 import sys
-from typing import Callable
-from collections import namedtuple
+from typing import Any, NamedTuple
 from docopt import docopt
 import numpy as np
+from numpy.typing import NDArray
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D  # type: ignore
 
@@ -32,45 +33,40 @@ TARGET_OFFSET = 5
 EXTENTS = 5
 NOISE = 10
 
-Point = namedtuple("Point", ["x", "y", "z"])
 
+class Points(NamedTuple):
+    """A set of points, stored as one array of coordinates per axis."""
 
-def generate_random_points(num_points: int) -> list[Point]:
+    x: NDArray[np.float64]
+    y: NDArray[np.float64]
+    z: NDArray[np.float64]
+
+
+def generate_random_points(num_points: int) -> Points:
     """Generate a number of points randomly."""
     rng = np.random.default_rng()
-    points: list[Point] = []
-    for _ in range(num_points):
-        temp_x = rng.uniform(-EXTENTS, EXTENTS)
-        temp_y = rng.uniform(-EXTENTS, EXTENTS)
-        temp_z = (
-            temp_x * TARGET_X_SLOPE
-            + temp_y * TARGET_Y_SLOPE
-            + TARGET_OFFSET
-            + rng.normal(scale=NOISE)
-        )
-        points.append(Point(temp_x, temp_y, temp_z))
-    return points
-
-
-def plot_points_and_best_fit(
-    points: list[Point], best_fit: Callable[[float, float], float]
-) -> None:
-    """Plot both the randomly generated points, generate best-fit function with a function."""
+    x_rand, y_rand = rng.uniform(-EXTENTS, EXTENTS, (2, num_points))
+    z_rand = (
+        x_rand * TARGET_X_SLOPE
+        + y_rand * TARGET_Y_SLOPE
+        + TARGET_OFFSET
+        + rng.normal(scale=NOISE, size=num_points)
+    )
+    return Points(x_rand, y_rand, z_rand)
+
+
+def plot_points_and_best_fit(points: Points, coeffs: NDArray[np.floating[Any]], order: int) -> None:
+    """Plot both the randomly generated points and the best-fit polynomial with coefficients."""
     fig = plt.figure()
     axes: Axes3D = fig.add_subplot(111, projection="3d")
-    x_rand = [point.x for point in points]
-    y_rand = [point.y for point in points]
-    z_rand = [point.z for point in points]
-    axes.scatter(x_rand, y_rand, z_rand, color="b")
+    axes.scatter(points.x, points.y, points.z, color="b")
 
     # Plot fitted focus map
     xlim = axes.get_xlim()
     ylim = axes.get_ylim()
-    x_grid, y_grid = np.meshgrid(np.arange(xlim[0], xlim[1]), np.arange(ylim[0], ylim[1]))
-    z_grid = np.zeros(x_grid.shape)
-    for row in range(x_grid.shape[0]):
-        for col in range(x_grid.shape[1]):
-            z_grid[row, col] = best_fit(x_grid[row, col], y_grid[row, col])
+    x_grid, y_grid, grid_xy_matrix = make_grid(xlim, ylim, order)
+    # Evaluate every grid location with a single matrix-vector product
+    z_grid = (grid_xy_matrix @ coeffs).reshape(x_grid.shape)
     axes.plot_wireframe(x_grid, y_grid, z_grid, color="k")
 
     axes.set_xlabel("x")
@@ -79,8 +75,60 @@ def plot_points_and_best_fit(
     plt.show()
 
 
-def polynomial_interpolation(order: int, num_points: int | None = None) -> None:
-    """Interpolate generic polynomial of any order."""
+def make_xy_matrix(
+    x_coords: NDArray[np.floating[Any]], y_coords: NDArray[np.floating[Any]], order: int
+) -> NDArray[np.floating[Any]]:
+    """
+    Make the xy matrix, with a row of x**n_x * y**n_y terms for each point.
+
+    The columns are ordered by n_x and then n_y, each going from 0 up to order.
+    The matrix has the same precision as the coordinates.
+    """
+    # np.vander always promotes to at least double precision, so cast back to the input type
+    x_powers = np.vander(x_coords, order + 1, increasing=True).astype(x_coords.dtype, copy=False)
+    y_powers = np.vander(y_coords, order + 1, increasing=True).astype(y_coords.dtype, copy=False)
+    return (x_powers[:, :, np.newaxis] * y_powers[:, np.newaxis, :]).reshape(len(x_coords), -1)
+
+
+@functools.lru_cache(maxsize=8)
+def make_grid(
+    xlim: tuple[float, float], ylim: tuple[float, float], order: int
+) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.floating[Any]]]:
+    """
+    Make a grid of x, y locations covering the limits, and the xy matrix for those locations.
+
+    The result is cached, so plotting another fit of the same order over the same limits
+    doesn't need to build the grid again. The returned arrays are read-only.
+    """
+    x_grid, y_grid = np.meshgrid(np.arange(xlim[0], xlim[1]), np.arange(ylim[0], ylim[1]))
+    xy_matrix = make_xy_matrix(x_grid.ravel(), y_grid.ravel(), order)
+    for array in (x_grid, y_grid, xy_matrix):
+        array.flags.writeable = False
+    return x_grid, y_grid, xy_matrix
+
+
+def fit_polynomial(
+    points: Points, order: int, dtype: type[np.floating[Any]] = np.float64
+) -> NDArray[np.floating[Any]]:
+    """
+    Calculate the coefficients of the polynomial of the given order that best fits the points.
+
+    The coefficients are in the same order as the columns of the xy matrix.
+    Passing np.float32 as the dtype halves the memory used by the fit, which makes it faster
+    for large numbers of points, but is only accurate enough for low order polynomials.
+    """
+    xy_matrix = make_xy_matrix(
+        points.x.astype(dtype, copy=False), points.y.astype(dtype, copy=False), order
+    )
+    z_coords = points.z.astype(dtype, copy=False)
+    coeffs: NDArray[np.floating[Any]] = np.linalg.lstsq(xy_matrix, z_coords, rcond=None)[0]
+    return coeffs
+
+
+def polynomial_interpolation(
+    order: int, num_points: int | None = None, dtype: type[np.floating[Any]] = np.float64
+) -> None:
+    """Interpolate generic polynomial of any order, fitting with the given floating point type."""
     if not num_points:
         num_points = (order + 1) ** 2
     print(f"Order {order} interpolation using {num_points} points")
@@ -88,43 +136,16 @@ def polynomial_interpolation(order: int, num_points: int | None = None) -> None:
     # Generate random points
     points = generate_random_points(num_points)
 
-    # Helper function for generating matrices for calculating best fit
-    def make_xy_row(x_i: float, y_i: float) -> list[float]:
-        """Make one row of the xy matrix."""
-        row: list[float] = []
-        for n_x in range(order + 1):
-            for n_y in range(order + 1):
-                row.append(x_i**n_x * y_i**n_y)
-        return row
-
-    # Generate the matrices for calculating best fit
-    temp_xy = []
-    temp_z = []
-    for i in range(num_points):
-        temp_xy.append(make_xy_row(points[i].x, points[i].y))
-        temp_z.append(points[i].z)
-    xy_matrix = np.matrix(temp_xy)
-    z_matrix = np.matrix(temp_z).T
-
-    # Calculate best fit coefficients, errors and residual
-    coeff_matrix = np.linalg.inv(xy_matrix.T * xy_matrix) * xy_matrix.T * z_matrix
-    errors = z_matrix - xy_matrix * coeff_matrix
+    # Calculate best fit coefficients
+    coeffs = fit_polynomial(points, order, dtype)
+
+    # Calculate errors and residual
+    errors = points.z - make_xy_matrix(points.x, points.y, order) @ coeffs
     residual = np.linalg.norm(errors)
     print("errors: \n", errors)
     print("residual:", residual)
 
-    # Define function to calculate z value based on best fit coefficients
-    def calculate_z(x_loc: float, y_loc: float) -> float:
-        """Calculate z based on x, y, and coefficients."""
-        z_sum = 0.0
-        index = 0
-        for n_x in range(order + 1):
-            for n_y in range(order + 1):
-                z_sum += coeff_matrix[index].item() * x_loc**n_x * y_loc**n_y
-                index += 1
-        return z_sum
-
-    plot_points_and_best_fit(points, calculate_z)
+    plot_points_and_best_fit(points, coeffs, order)
 
 
 def main() -> None:
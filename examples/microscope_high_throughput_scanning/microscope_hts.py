@@ -55,7 +55,7 @@ def main() -> None:  # pylint: disable=too-many-statements
             Units.ACCELERATION_METRES_PER_SECOND_SQUARED,
         )
 
-        def area_mode(stream: Stream, scan_axis: Axis, direction: int, trigger_dist: float) -> None:
+        def area_mode(stream: Stream, scan_axis: Axis, step: Measurement) -> None:
             """Add stream segments required for stop-and-shoot imaging."""
             stream.wait(1)  # Force stage to stop
             stream.io.set_digital_output_schedule(
@@ -64,24 +64,16 @@ def main() -> None:  # pylint: disable=too-many-statements
                 DigitalOutputAction.OFF,
                 max(PROTOCOL["exposure"] / 1000, 1),
             )  # Trigger the camera
-            stream.line_relative_on(
-                [scan_axis.axis_number - 1], [Measurement(direction * trigger_dist, MM)]
-            )
+            stream.line_relative_on([scan_axis.axis_number - 1], [step])
 
-        def continuous_mode(
-            stream: Stream, scan_axis: Axis, direction: int, trigger_dist: float
-        ) -> None:
+        def continuous_mode(stream: Stream, scan_axis: Axis, half_step: Measurement) -> None:
             """Add stream segments required for continuous scan imaging."""
             stream.io.set_digital_output(1, DigitalOutputAction.ON)  # Trigger the camera
             stream.line_relative_on(
-                [scan_axis.axis_number - 1],  # Move half distance to next point
-                [Measurement(direction * trigger_dist / 2, MM)],
+                [scan_axis.axis_number - 1], [half_step]  # Move half distance to next point
             )
             stream.io.set_digital_output(1, DigitalOutputAction.OFF)  # Turn off trigger
-            stream.line_relative_on(
-                [scan_axis.axis_number - 1],
-                [Measurement(direction * trigger_dist / 2, MM)],
-            )
+            stream.line_relative_on([scan_axis.axis_number - 1], [half_step])
 
         def generate_snake(
             protocol: dict[str, Any], scan_speed: float, focus_map: NDArray[Any] | None = None
@@ -129,7 +121,10 @@ def main() -> None:  # pylint: disable=too-many-statements
 
             trigger_dist = CAM["sensor_height"] / protocol["mag"]
             for i in range(n_scans):
-                direction = pow(-1, i % 2)
+                direction = -1 if i % 2 else 1  # Alternate the scan direction
+                # Every frame in the scan moves the same distance, so only create these once
+                step = Measurement(direction * trigger_dist, MM)
+                half_step = Measurement(direction * trigger_dist / 2, MM)
                 # Need to move n-1 steps to cover full image
                 stream.set_max_speed(scan_speed, Units.VELOCITY_MILLIMETRES_PER_SECOND)
                 if mode == "TDI":
@@ -140,9 +135,9 @@ def main() -> None:  # pylint: disable=too-many-statements
                 for j in range(frames):
                     match mode:
                         case "area":
-                            area_mode(stream, scan_axis, direction, trigger_dist)
+                            area_mode(stream, scan_axis, step)
                         case "continuous":
-                            continuous_mode(stream, scan_axis, direction, trigger_dist)
+                            continuous_mode(stream, scan_axis, half_step)
 
                     if focus_map is not None:
                         # Prepare a focus move
@@ -2,36 +2,57 @@
 
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
-from zaber_motion.ascii import Connection, WarningFlags, Axis
+from zaber_motion.ascii import Connection, WarningFlags, Axis, Device
 
 SERIAL_PORT = "COMx"
 
+PULSE_DURATION_MS = 43.5
+PULSE_GAP_S = 0.1  # Time between the end of one pulse and the start of the next
+
+
+def probe_channel(device: Device, index: int) -> tuple[str, Axis] | None:
+    """Return the color name and lamp axis of a channel, or None if the channel is inactive.
+
+    :param device: The X-LCA device the MLR is connected to
+    :param index: The axis number of the channel
+    """
+    lamp = device.get_axis(index)
+    if WarningFlags.PERIPHERAL_INACTIVE in lamp.warnings.get_flags():
+        return None
+
+    color = int(lamp.settings.get("lamp.wavelength.peak"))
+    if color == 0:
+        color_name = "white"
+    else:
+        color_name = str(color)
+    return color_name, lamp
+
 
 def main() -> None:
     """Connect to a Zaber X-LCA with a connected MLR3 and sequentially turn on specific channels."""
     with Connection.open_serial_port(SERIAL_PORT) as connection:
-        channels = {}
         device_list = connection.detect_devices()
         try:
             device = next(x for x in device_list if "LCA" in x.name)
-            for i in range(1, 5):
-                lamp = device.get_axis(i)
-                if WarningFlags.PERIPHERAL_INACTIVE not in lamp.warnings.get_flags():
-                    # Channel is properly activated, list available channels
-                    color = int(lamp.settings.get("lamp.wavelength.peak"))
-                    if color == 0:
-                        color_name = "white"
-                    else:
-                        color_name = str(color)
-
-                    channels[color_name] = lamp
-                    print(f"Channel # {i} is {lamp.peripheral_name}")
-
         except StopIteration:
             print("No LCA available")
             sys.exit()
 
+        # Query the channels in parallel, so that waiting on the replies overlaps
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            probed_channels = list(executor.map(partial(probe_channel, device), range(1, 5)))
+
+        channels = {}
+        for i, probed_channel in enumerate(probed_channels, start=1):
+            if probed_channel is not None:
+                # Channel is properly activated, list available channels
+                color_name, lamp = probed_channel
+                channels[color_name] = lamp
+                print(f"Channel # {i} is {lamp.peripheral_name}")
+
         def set_intensity(
             channel: Axis, percent: float = 100, flux_watts: float | None = None
         ) -> None:
@@ -47,23 +68,30 @@ def main() -> None:
             else:
                 channel.settings.set("lamp.flux", max_flux * percent / 100)
 
-        def pulse_channel(channel: Axis, duration: float = 50) -> bool:
+        def pulse_channel(channel: Axis, duration: float = 50, wait: bool = True) -> bool:
             """Pulse a MLR led channel for a given duration.
 
             :param channel: Axis object for the lamp to activate
             :param duration: On time in ms
+            :param wait: Wait for the pulse to end. The device turns the lamp off by itself,
+            so this can be False if the caller takes care of timing.
             """
             channel.generic_command(f"lamp on {duration}")
-            time.sleep(duration / 1000)
+            if wait:
+                time.sleep(duration / 1000)
             return True
 
         for wavelength, led in channels.items():
             set_intensity(led, 98.7)
             if wavelength != "385":  # Don't flash UV during testing
                 print(f"Pulsing channel {wavelength}")
-                for i in range(10):
-                    pulse_channel(led, 43.5)
-                    time.sleep(0.1)
+                # Time each pulse from the start of the previous one, so the time taken
+                # to send the command overlaps with the pulse rather than adding to it
+                next_pulse = time.monotonic()
+                for _ in range(10):
+                    pulse_channel(led, PULSE_DURATION_MS, wait=False)
+                    next_pulse += PULSE_DURATION_MS / 1000 + PULSE_GAP_S
+                    time.sleep(max(next_pulse - time.monotonic(), 0))
 
 
 if __name__ == "__main__":
@@ -107,6 +107,92 @@ def try_stitch_images(tiles: list[MatLike], file_name: str, scale: float = 1.0)
         print(f"cv2.Stitcher failed with error code: {status}: {CV2_ERR_DICT[status]}.")
 
 
+def get_grid_shift(
+    tile_a: MatLike, tile_b: MatLike, nominal_x: int, nominal_y: int
+) -> NDArray[np.float64]:
+    """
+        Measure the offset of tile_b from tile_a, given the nominal offset between them.
+
+        Only the strips that overlap at the nominal offset are compared, and the residual
+        shift is found with phase correlation rather than feature matching.
+
+    Args:
+        tile_a: reference tile
+        tile_b: neighbouring tile, to the right of or below tile_a
+        nominal_x: expected horizontal offset of tile_b from tile_a in pixels
+        nominal_y: expected vertical offset of tile_b from tile_a in pixels
+
+    Returns:
+        NDArray[np.float64]: measured x, y offset of tile_b from tile_a in pixels
+    """
+    height, width = tile_a.shape[:2]
+    strip_a = tile_a[nominal_y:, nominal_x:]
+    strip_b = tile_b[: height - nominal_y, : width - nominal_x]
+    if strip_a.ndim == 3:
+        strip_a = cv2.cvtColor(strip_a, cv2.COLOR_BGR2GRAY)
+        strip_b = cv2.cvtColor(strip_b, cv2.COLOR_BGR2GRAY)
+    (shift_x, shift_y), _ = cv2.phaseCorrelate(
+        strip_a.astype(np.float32), strip_b.astype(np.float32)
+    )
+    return np.array([nominal_x - shift_x, nominal_y - shift_y])
+
+
+def stitch_grid(
+    tiles: list[list[MatLike]],
+    overlap_h: float,
+    overlap_v: float,
+    file_name: str,
+    scale: float = 1.0,
+) -> None:
+    """
+        Stitch a grid of tiles by placing each one at its refined grid offset.
+
+        Because the tiles come from a known grid with known overlap, no feature matching is
+        needed. Each tile's offset from its left neighbour (or, for the first tile of a row,
+        from the tile above) is refined with phase correlation in the overlap strip, and the
+        tiles are pasted onto a single canvas.
+
+    Args:
+        tiles (list[list[MatLike]]): list of tile rows, each ordered left to right
+        overlap_h: horizontal overlap between tiles (decimal percentage)
+        overlap_v: vertical overlap between tiles (decimal percentage)
+        file_name: name of file to be saved
+        scale: decimal percentage representing scale of final image
+
+    Raises:
+        ValueError: if the grid is empty or has an empty row
+    """
+    assert 0.0 < overlap_h < 1.0 and 0.0 < overlap_v < 1.0, "grid stitching needs some overlap"
+    if not tiles or not all(tiles):
+        raise ValueError("grid stitching needs at least one tile in every row")
+    if scale < 1.0:
+        tiles = [[resize_image(img, scale) for img in row] for row in tiles]
+
+    height, width = tiles[0][0].shape[:2]
+    step_x: int = round((1.0 - overlap_h) * width)
+    step_y: int = round((1.0 - overlap_v) * height)
+
+    positions: list[list[NDArray[np.float64]]] = []
+    for idx_y, row in enumerate(tiles):
+        if idx_y == 0:
+            row_positions = [np.zeros(2)]
+        else:
+            above = positions[idx_y - 1][0]
+            row_positions = [above + get_grid_shift(tiles[idx_y - 1][0], row[0], 0, step_y)]
+        for idx_x in range(1, len(row)):
+            shift = get_grid_shift(row[idx_x - 1], row[idx_x], step_x, 0)
+            row_positions.append(row_positions[-1] + shift)
+        positions.append(row_positions)
+
+    corners = np.rint(np.concatenate(positions)).astype(int)
+    corners -= corners.min(axis=0)
+    canvas_width, canvas_height = corners.max(axis=0) + [width, height]
+    canvas = np.zeros((canvas_height, canvas_width) + tiles[0][0].shape[2:], tiles[0][0].dtype)
+    for (x, y), tile in zip(corners, (tile for row in tiles for tile in row)):
+        canvas[y : y + height, x : x + width] = tile
+    cv2.imwrite(file_name, canvas)
+
+
 def join_tiles(
     tiles: list[list[MatLike]], num_rows: int, file_name: str, scale: float = 1.0
 ) -> None:
@@ -1,7 +1,7 @@
 """Example code entry point."""
 
 import os
-import itertools
+from concurrent.futures import Future, ThreadPoolExecutor
 import numpy as np
 import cv2
 
@@ -11,7 +11,7 @@ from zaber_motion.ascii import Connection, AxisGroup
 from zaber_motion import Measurement, Units
 from zaber_motion.microscopy import Microscope
 from .basler_camera_wrapper import BaslerCameraWrapper
-from .example_util import try_stitch_images, join_tiles
+from .example_util import try_stitch_images, stitch_grid, join_tiles
 from .path_builder import PathBuilder
 
 # user-specified params
@@ -30,24 +30,32 @@ OVERLAP_V: float = 0.5
 
 # image capture
 SAVE_FOLDER: str = "tiles"
+IMAGE_FORMAT: str = ".png"  # ".png", ".jpg" or ".bmp"
+PNG_COMPRESSION: int = 1  # 0 (fastest, largest) to 9 (slowest, smallest)
+JPEG_QUALITY: int = 92
+USE_MULTIPAGE_TIFF: bool = False  # save all tiles as pages of one TIFF instead of a file per tile
+VERBOSE: bool = False  # print a line for every captured tile
 RUN_BEST_EFFORT_STITCHING: bool = True
+RUN_GRID_STITCHING: bool = False
 RUN_NAIVE_TILING: bool = False
 
 BEST_EFFORT_STITCHING_FILENAME: str = "best_effort_stitched_tiles.png"
+GRID_STITCHING_FILENAME: str = "grid_stitched_tiles.png"
 RUN_NAIVE_TILING_FILENAME: str = "naive_tiled_image.png"
 STITCHING_EXAMPLE_FILENAME: str = "stitching_example.png"
+MULTIPAGE_TIFF_FILENAME: str = "tiles.tiff"
 
 # non user-controlled params
-CENTRE: NDArray[np.float64] = TOP_LEFT + (BOTTOM_RIGHT - TOP_LEFT) / 2.0
 EPSILON: float = 0.0000001
+WRITER_THREADS: int = 4
 
 
 def main() -> None:
     """Run microscope tiling example."""
     check_user_specified_params()
+    configure_opencv()
 
-    if not os.path.exists(SAVE_FOLDER):
-        os.makedirs(SAVE_FOLDER)
+    os.makedirs(SAVE_FOLDER, exist_ok=True)
 
     with Connection.open_serial_port(SERIAL_PORT) as connection:
         connection.detect_devices()
@@ -62,30 +70,30 @@ def main() -> None:
             microscope.initialize()
         print("Microscope is initialized.")
 
-        camera: BaslerCameraWrapper = BaslerCameraWrapper()
-
-        path_builder: PathBuilder = PathBuilder(
-            PIXEL_WIDTH_MICRONS,
-            PIXEL_HEIGHT_MICRONS,
-            CAMERA_ROTATION_RAD,
-            camera.get_frame_width(),
-            camera.get_frame_height(),
-        )
-        tiling_path = path_builder.get_path_snake(
-            TOP_LEFT, BOTTOM_RIGHT, POINTS_UNITS, OVERLAP_H, OVERLAP_V
-        )
+        with BaslerCameraWrapper() as camera:
+            path_builder: PathBuilder = PathBuilder(
+                PIXEL_WIDTH_MICRONS,
+                PIXEL_HEIGHT_MICRONS,
+                CAMERA_ROTATION_RAD,
+                camera.get_frame_width(),
+                camera.get_frame_height(),
+            )
+            tiling_path = path_builder.get_path_snake(
+                TOP_LEFT, BOTTOM_RIGHT, POINTS_UNITS, OVERLAP_H, OVERLAP_V
+            )
 
-        tiles = capture_images(tiling_path, camera, plate)
+            tiles, tiles_flattened = capture_images(tiling_path, camera, plate)
         num_rows: int = len(tiling_path)
 
         if RUN_BEST_EFFORT_STITCHING:
             try:
-                tiles_flattened: list[MatLike] = list(itertools.chain(*tiles))
                 try_stitch_images(tiles_flattened, BEST_EFFORT_STITCHING_FILENAME)
             except AssertionError as e:
                 print("Stitching failed with AssertionError: ", e)
             except RuntimeError as e:
                 print("Stitching failed with RuntimeError: ", e)
+        if RUN_GRID_STITCHING:
+            stitch_grid(tiles, OVERLAP_H, OVERLAP_V, GRID_STITCHING_FILENAME)
         if RUN_NAIVE_TILING:
             join_tiles(tiles, num_rows, RUN_NAIVE_TILING_FILENAME)
 
@@ -94,10 +102,16 @@ def capture_images(
     tiling_path: PathBuilder.MotionPath,
     camera: BaslerCameraWrapper,
     plate: AxisGroup,
-) -> list[list[MatLike]]:
+) -> tuple[list[list[MatLike]], list[MatLike]]:
     """
         Move along provided path, capturing and saving an image at each point.
 
+    As soon as a frame has been read out of the camera the plate starts moving to the next point,
+    so converting the frame overlaps with the move. Images are encoded and written to disk on a
+    thread pool so that saving a tile overlaps with moving to and capturing the next one.
+
+    With USE_MULTIPAGE_TIFF, the tiles are instead saved together once capture is finished.
+
     Args:
         tiling_path (PathBuilder.MotionPath): the path generated from pathbuilder
         camera: the camera which will be used to take pictures
@@ -107,57 +121,129 @@ def capture_images(
         RuntimeError: raised if camera API fails to capture an image for whatever reason
 
     Returns:
-        list[list[MatLike]]: list of rows of captured images
+        tuple[list[list[MatLike]], list[MatLike]]: list of rows of captured images, and the same
+        images as a single list in row order
     """
-    tiles: list[list[MatLike]] = []
-    idx_y: int
-    grid_row: list[tuple[float, float]]
-    for idx_y, grid_row in enumerate(tiling_path):
-        tile_row: list[MatLike] = []
-        idx_x: int
-        point: tuple[float, float]
-        for idx_x, point in enumerate(grid_row):
-            plate.move_absolute(
-                Measurement(point[0], Units.LENGTH_MICROMETRES),
-                Measurement(point[1], Units.LENGTH_MICROMETRES),
-            )
-            img = camera.grab_frame()
+    # (row, column in tileset, plate position) in the order the plate visits them
+    positions: list[tuple[int, int, NDArray[np.float64]]] = [
+        (idx_y, idx_x if not idx_y & 1 else len(grid_row) - idx_x - 1, point)
+        for idx_y, grid_row in enumerate(tiling_path)
+        for idx_x, point in enumerate(grid_row)
+    ]
+    tiles: list[list[MatLike]] = [[] for _ in tiling_path]
+    tiles_flattened: list[MatLike] = []
+    if not positions:
+        return tiles, tiles_flattened
+    writes: list[Future[bool]] = []
+    write_params: list[int] = get_write_params()
+    with ThreadPoolExecutor(max_workers=1) as mover, ThreadPoolExecutor(
+        max_workers=WRITER_THREADS
+    ) as writer:
+        move: Future[None] = mover.submit(move_plate, plate, positions[0][2])
+        for i, (idx_y, idx_x, _) in enumerate(positions):
+            move.result()
+            raw = camera.grab_frame(convert_to_bgr=False)
+            # The frame has been read out, so the plate is free to move on
+            if i + 1 < len(positions):
+                move = mover.submit(move_plate, plate, positions[i + 1][2])
+            img = cv2.cvtColor(raw, cv2.COLOR_GRAY2BGR)
 
-            tile_row.append(img)
-            filename: str = SAVE_FOLDER
-            if not idx_y & 1:
-                filename += f"/tile_{idx_y}_{idx_x}.png"
-            else:
-                filename += f"/tile_{idx_y}_{len(grid_row) - idx_x - 1}.png"
-            cv2.imwrite(filename, img)
-            print(f"Saved image with dimensions ({img.shape}) to tileset: {filename} ", filename)
+            tiles[idx_y].append(img)
+            if USE_MULTIPAGE_TIFF:
+                continue
+            filename: str = f"{SAVE_FOLDER}/tile_{idx_y}_{idx_x}{IMAGE_FORMAT}"
+            writes.append(writer.submit(cv2.imwrite, filename, img, write_params))
+            if VERBOSE:
+                print(f"Queued image with dimensions ({img.shape}) for tileset: {filename}")
 
+    for idx_y, tile_row in enumerate(tiles):
         if idx_y & 1:
             tile_row.reverse()
-        tiles.append(tile_row)
-    return tiles
+        tiles_flattened.extend(tile_row)
+
+    if USE_MULTIPAGE_TIFF:
+        # One sequential, uncompressed write instead of a file per tile; pages are in row order
+        tiff_path: str = f"{SAVE_FOLDER}/{MULTIPAGE_TIFF_FILENAME}"
+        if not cv2.imwritemulti(tiff_path, tiles_flattened, [cv2.IMWRITE_TIFF_COMPRESSION, 1]):
+            raise RuntimeError("Failed to save the tile images.")
+        print(f"Saved {len(tiles_flattened)} tiles to {tiff_path}")
+        return tiles, tiles_flattened
+
+    # Surface any exception raised while writing a tile
+    for write in writes:
+        if not write.result():
+            raise RuntimeError("Failed to save a tile image.")
+    print(f"Saved {len(writes)} tiles to {SAVE_FOLDER}")
+    return tiles, tiles_flattened
+
+
+def move_plate(plate: AxisGroup, point: NDArray[np.float64]) -> None:
+    """
+        Move the plate to a point and wait until it stops.
+
+    Args:
+        plate: the microscope plate
+        point (NDArray[np.float64]): the x and y position to move to in micrometres
+    """
+    plate.move_absolute(
+        Measurement(float(point[0]), Units.LENGTH_MICROMETRES),
+        Measurement(float(point[1]), Units.LENGTH_MICROMETRES),
+    )
+
+
+def get_write_params() -> list[int]:
+    """
+    Get the cv2.imwrite encoder params for the configured IMAGE_FORMAT.
+
+    Raw sensor images compress poorly, so libpng's default deflate level mostly costs time. A low
+    compression level with the RLE strategy writes PNG tiles several times faster.
+
+    Returns:
+        list[int]: flat list of encoder param ids and values
+    """
+    if IMAGE_FORMAT == ".png":
+        return [
+            cv2.IMWRITE_PNG_COMPRESSION,
+            PNG_COMPRESSION,
+            cv2.IMWRITE_PNG_STRATEGY,
+            cv2.IMWRITE_PNG_STRATEGY_RLE,
+        ]
+    if IMAGE_FORMAT in (".jpg", ".jpeg"):
+        return [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY]
+    return []
 
 
 def stitching_example() -> None:
     """Run image stitching example with example image tileset."""
+    configure_opencv()
     tiles_path: str = "./img/example_tiles"
     print("Loading images from ", tiles_path)
     example_tileset: list[MatLike] = []
-    sorted_filenames: list[str] = sorted(os.listdir(tiles_path))
-    for filename in sorted_filenames:
-        img_path: str = os.path.join(tiles_path, filename)
-        if os.path.isfile(img_path):
-            image: MatLike = cv2.imread(img_path)
-            if image is not None:
-                print(f"Loading image with dimensions ({image.shape}): {img_path} ")
-                example_tileset.append(image)
-            else:
-                print("Failed to find image: ", img_path)
+    # scandir reports the entry type along with the name, avoiding a stat call per file
+    with os.scandir(tiles_path) as entries:
+        img_paths: list[str] = sorted(entry.path for entry in entries if entry.is_file())
+    # Decoding dominates loading and releases the GIL, so decode the tiles in parallel
+    with ThreadPoolExecutor() as reader:
+        images: list[MatLike | None] = list(reader.map(cv2.imread, img_paths))
+    for img_path, image in zip(img_paths, images):
+        if image is not None:
+            print(f"Loaded image with dimensions ({image.shape}): {img_path} ")
+            example_tileset.append(image)
+        else:
+            print("Failed to find image: ", img_path)
 
     print(f"Stitching {len(example_tileset)} images")
     try_stitch_images(example_tileset, STITCHING_EXAMPLE_FILENAME)
 
 
+def configure_opencv() -> None:
+    """Make sure openCV uses its optimized code paths and all cores for stitching."""
+    cv2.setUseOptimized(True)
+    cv2.setNumThreads(os.cpu_count() or 4)
+    if not cv2.useOptimized():
+        print("Warning: openCV was built without optimized code paths, stitching will be slow")
+
+
 def check_user_specified_params() -> None:
     """Verify that user-specified params are valid and provide feedback."""
     assert TOP_LEFT[0] <= BOTTOM_RIGHT[0], "It must be that TOP_LEFT.x <= BOTTOM_RIGHT.x"
@@ -166,9 +252,17 @@ def check_user_specified_params() -> None:
         np.abs(CAMERA_ROTATION_RAD) <= np.pi / 4.0
     ), "CAMERA_ROTATION_RAD should not be greater than 45°. Please adjust camera."
 
+    assert IMAGE_FORMAT in (
+        ".png",
+        ".jpg",
+        ".jpeg",
+        ".bmp",
+    ), "IMAGE_FORMAT must be one of .png, .jpg, .jpeg or .bmp"
+    assert 0 <= PNG_COMPRESSION <= 9, "PNG_COMPRESSION must be between 0 and 9"
+
     assert PIXEL_WIDTH_MICRONS > 0.0, "PIXEL_WIDTH_MICRONS must be greater than 0"
     assert PIXEL_HEIGHT_MICRONS > 0.0, "PIXEL_WIDTH_MICRONS must be greater than 0"
-    if RUN_BEST_EFFORT_STITCHING and (OVERLAP_H < 0.1 or OVERLAP_V < 0.1):
+    if (RUN_BEST_EFFORT_STITCHING or RUN_GRID_STITCHING) and (OVERLAP_H < 0.1 or OVERLAP_V < 0.1):
         print("Warning: At least 0.1 horizontal and vertical overlap is recommended for stitching")
     if RUN_NAIVE_TILING and (OVERLAP_H > 0.0 or OVERLAP_V > 0.0):
         print("Warning: 0.0 overlap is suggested for naive tiling")
@@ -1,5 +1,6 @@
 """PathBuilder module."""
 
+import math
 import numpy as np
 from numpy.typing import NDArray
 from zaber_motion import Units
@@ -12,7 +13,8 @@ from .example_util import (
 class PathBuilder:
     """PathBuilder provides functionality for generating paths for camera tiling."""
 
-    MotionPath = list[list[tuple[float, float]]]
+    # (rows, points per row, xy) array of plate positions in microns
+    MotionPath = NDArray[np.float64]
 
     def __init__(
         self,
@@ -26,6 +28,7 @@ class PathBuilder:
         self._pixel_w_um = pixel_w_um
         self._pixel_h_um = pixel_h_um
         self._rotation = camera_rotation
+        self._is_axis_aligned = abs(camera_rotation) < 1e-9
         self._rotation_matrix_2d = np.array(
             [
                 [np.cos(camera_rotation), -np.sin(camera_rotation)],
@@ -47,8 +50,8 @@ class PathBuilder:
             Generate snaking grid path from top left to bottom right point.
 
             Each path point overlaps with its neighbouring tiles by overlap_h and overlap_v
-            percentage. The path is a 2d list where each row of points is a horizontal row
-            of the path.
+            percentage. The path is a (rows, points per row, 2) array where each row of points is
+            a horizontal row of the path.
 
         Args:
             top_left: top left corner of tiling region
@@ -79,21 +82,27 @@ class PathBuilder:
         x_right_um = bottom_right_microns[0] + (coverage_x - sample_area_width_um) / 2.0
         y_top_um = top_left_microns[1] + (coverage_y - sample_area_height_um) / 2.0
 
-        path: PathBuilder.MotionPath = []
-        for y in range(steps_y):
-            y_pos = y_top_um - y * step_y_um
-            grid_row: list[tuple[float, float]] = []
-            for x in range(steps_x):
-                x_pos = 0.0
-                if not y & 1:
-                    x_pos = x_left_um + x * step_x_um
-                else:
-                    x_pos = x_right_um - x * step_x_um
-
-                step_vec: NDArray[np.float64] = np.array([x_pos - x_left_um, 0.0])
-                step_vec = self._rotation_matrix_2d @ step_vec
-                grid_row.append((x_left_um + step_vec[0], y_pos + step_vec[1]))
-            path.append(grid_row)
+        # Each step vector is (x_pos - x_left_um, 0), so rotating it only needs cos and sin
+        cos_r: float = self._rotation_matrix_2d[0, 0]
+        sin_r: float = self._rotation_matrix_2d[1, 0]
+        x_offsets = np.arange(steps_x) * step_x_um
+
+        y_positions = (y_top_um - np.arange(steps_y) * step_y_um)[:, np.newaxis]
+
+        path: PathBuilder.MotionPath = np.empty((steps_y, steps_x, 2))
+        if self._is_axis_aligned:
+            # Without rotation each row keeps a single y, so no trig is needed
+            path[0::2, :, 0] = x_left_um + x_offsets
+            path[1::2, :, 0] = x_left_um + ((x_right_um - x_left_um) - x_offsets)
+            path[:, :, 1] = y_positions
+            return path
+
+        # Odd rows run right to left
+        x_steps = np.empty((steps_y, steps_x))
+        x_steps[0::2] = x_offsets
+        x_steps[1::2] = (x_right_um - x_left_um) - x_offsets
+        path[:, :, 0] = x_left_um + x_steps * cos_r
+        path[:, :, 1] = y_positions + x_steps * sin_r
         return path
 
     @staticmethod
@@ -108,7 +117,7 @@ class PathBuilder:
         Returns:
             tuple[int, float]: number of steps, coverage of n steps of length step_um
         """
-        steps: int = int(np.floor(distance_um / step_um) + 1)
+        steps: int = math.floor(distance_um / step_um) + 1
         coverage = (steps - 1) * step_um
         if coverage < distance_um:
             steps += 1
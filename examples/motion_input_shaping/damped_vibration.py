@@ -5,6 +5,7 @@
 
 import math
 import numpy as np
+from numpy.typing import NDArray
 
 
 class DampedVibration:
@@ -29,6 +30,8 @@ class DampedVibration:
         :param offset: The y value about which the amplitude is centered on. Must have the same
         units as amplitude.
         """
+        # omega and decay_rate are cached when frequency or damping_ratio change
+        self._damping_ratio = 0.0
         self.frequency = frequency
         self.damping_ratio = damping_ratio
         self.amplitude = amplitude
@@ -47,6 +50,8 @@ class DampedVibration:
             raise ValueError(f"Invalid frequency: {value}. Value must be greater than 0.")
 
         self._frequency = value
+        self._omega = value * 2 * math.pi
+        self._decay_rate = self._omega * self._damping_ratio
 
     @property
     def period(self) -> float:
@@ -75,6 +80,7 @@ class DampedVibration:
             )
 
         self._damping_ratio = value
+        self._decay_rate = self._omega * value
 
     @property
     def amplitude(self) -> float:
@@ -109,12 +115,12 @@ class DampedVibration:
     @property
     def omega(self) -> float:
         """Get the vibration resonant frequency in radian/s."""
-        return self.frequency * 2 * math.pi
+        return self._omega
 
     @property
     def decay_rate(self) -> float:
         """Get the vibration decay rate in [radian/s]."""
-        return self.omega * self.damping_ratio
+        return self._decay_rate
 
     def get_exponent_decay(self, time_seconds: float) -> float:
         """
@@ -122,7 +128,7 @@ class DampedVibration:
 
         :param time_seconds: The relative time in seconds.
         """
-        return float(math.e ** (-1 * self.decay_rate * time_seconds))
+        return math.exp(-self.decay_rate * time_seconds)
 
     def get_magnitude(self, time_x: float) -> float:
         """
@@ -137,9 +143,9 @@ class DampedVibration:
 
     def get_plot_points(
         self, number_periods: float, number_points: int
-    ) -> tuple[list[float], list[float]]:
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
         """
-        Get a list of times and magnitudes for a given number of vibration periods.
+        Get arrays of times and magnitudes for a given number of vibration periods.
 
         :param number_periods: The number of vibration periods from the start to return data points
         for.
@@ -147,8 +153,12 @@ class DampedVibration:
         """
         end_time = self.start_time + number_periods * self.period
 
-        times = list(np.linspace(self.start_time, end_time, num=number_points))
-        magnitudes = [self.get_magnitude(t) for t in times]
+        # Calculate all points at once with NumPy rather than calling get_magnitude() for each
+        times = np.linspace(self.start_time, end_time, num=number_points)
+        rel_times = times - self.start_time
+        magnitudes = (
+            self.amplitude * np.sin(self.omega * rel_times) * np.exp(-self.decay_rate * rel_times)
+        ) + self.offset
 
         return times, magnitudes
 
@@ -163,9 +173,9 @@ class DampedVibration:
 
     def get_decay_plot_points(
         self, number_periods: float, number_points: int
-    ) -> tuple[list[float], list[float]]:
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
         """
-        Get a list of times and decay curve magnitudes for a given number of vibration periods.
+        Get arrays of times and decay curve magnitudes for a given number of vibration periods.
 
         :param number_periods: The number of vibration periods from the start to return data points
         for.
@@ -173,7 +183,9 @@ class DampedVibration:
         """
         end_time = self.start_time + number_periods * self.period
 
-        times = list(np.linspace(self.start_time, end_time, num=number_points))
-        magnitudes = [self.get_decay_magnitude(t) for t in times]
+        # Calculate all points at once with NumPy rather than calling get_decay_magnitude() for each
+        times = np.linspace(self.start_time, end_time, num=number_points)
+        rel_times = times - self.start_time
+        magnitudes = (self.amplitude * np.exp(-self.decay_rate * rel_times)) + self.offset
 
         return times, magnitudes
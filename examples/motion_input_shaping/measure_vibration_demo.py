@@ -44,7 +44,7 @@ def update_vibration_plot(plot_series: Any, damped_vibration: DampedVibration) -
     points_per_period = 50  # plot 50 points per period
 
     times, magnitudes = damped_vibration.get_plot_points(periods, periods * points_per_period)
-    times = [x * 1000.0 for x in times]  # Convert to ms.
+    times = times * 1000.0  # Convert to ms.
 
     plot_series.set_xdata(times)
     plot_series.set_ydata(magnitudes)
@@ -4,18 +4,48 @@ This file contains the ShapedAxis class, which is to be re-used in your code.
 Run the file directly to test the class out with a Zaber Device.
 """
 
-# pylint: disable=too-many-arguments
+# pylint: disable=too-many-arguments, too-many-instance-attributes
 
-import numpy as np
-from zaber_motion import Units
-from zaber_motion.ascii import Axis, Lockstep
+from typing import Callable
+from zaber_motion import Units, MotionLibException
+from zaber_motion.ascii import Axis, Lockstep, GetSetting
 from zero_vibration_shaper import ZeroVibrationShaper
 from plant import Plant
 
+# Units used on every move, resolved once rather than looked up on the enum each time
+_U_NATIVE = Units.NATIVE
+_U_MM = Units.LENGTH_MILLIMETRES
+_U_MMPS = Units.VELOCITY_MILLIMETRES_PER_SECOND
+_U_MMPS2 = Units.ACCELERATION_MILLIMETRES_PER_SECOND_SQUARED
+
+# Deceleration changes up to this many native units are too small to affect the shaping, so the
+# setting is left as is rather than rewritten on the device.
+DECEL_DEADBAND_NATIVE = 1
+
 
 class ShapedAxis:
     """A Zaber device axis that performs moves with input shaping vibration reduction theory."""
 
+    __slots__ = (
+        "axis",
+        "shaper",
+        "_lockstep_axis_numbers",
+        "_lockstep_axes",
+        "_primary_axis",
+        "_lockstep_spans_device",
+        "_get_axes_setting",
+        "_set_axes_setting",
+        "_get_min_axes_setting",
+        "_mm_per_native",
+        "_max_speed_limit",
+        "_homed_cached",
+        "_last_commanded_native",
+        "_original_deceleration",
+        "_deceleration",
+        "_limit_max",
+        "_limit_min",
+    )
+
     def __init__(
         self,
         zaber_axis: Axis | Lockstep,
@@ -27,42 +57,79 @@ class ShapedAxis:
         :param zaber_axis: The Zaber Motion Axis or Lockstep object
         :param plant: The Plant instance defining the system that the shaper is targeting.
         """
+        if zaber_axis is None:
+            raise TypeError("No Axis or Lockstep was used to initialize ShapedAxis.")
         if isinstance(zaber_axis, Axis):
             # Sanity check if the passed axis has a higher number than the number of axes on the
+            # device. The axis count comes from the device identity, so this doesn't query the
             # device.
-            if zaber_axis.axis_number > zaber_axis.device.axis_count or zaber_axis is None:
+            if zaber_axis.axis_number > zaber_axis.device.axis_count:
                 raise TypeError("Invalid Axis class was used to initialized ShapedAxis.")
-        elif isinstance(zaber_axis, Lockstep):
-            # Sanity check if the passed lockstep group number exceeds than the number of
-            # lockstep groups on the device.
-            if (
-                zaber_axis.lockstep_group_id > zaber_axis.device.settings.get("lockstep.numgroups")
-                or zaber_axis is None
-            ):
-                raise TypeError("Invalid Lockstep class was used to initialized ShapedAxis.")
+        # An invalid lockstep group is reported by the device when its axis numbers are read below,
+        # so it isn't worth an extra request to check the number of lockstep groups here.
 
         self.axis = zaber_axis
 
+        # Pick the setting accessors for this kind of axis once, rather than checking on every call
+        self._get_axes_setting: Callable[[str, Units], list[float]]
+        self._set_axes_setting: Callable[[str, list[float], Units], None]
+        self._get_min_axes_setting: Callable[[str, Units], float]
         if isinstance(self.axis, Lockstep):
             # Get axis numbers that are used so that settings can be changed
+            self._lockstep_axis_numbers = self.axis.get_axis_numbers()
             self._lockstep_axes = []
-            for axis_number in self.axis.get_axis_numbers():
+            for axis_number in self._lockstep_axis_numbers:
                 self._lockstep_axes.append(self.axis.device.get_axis(axis_number))
             self._primary_axis = self._lockstep_axes[0]
+            # If the group uses every axis on the device, one device-scope write sets them all
+            self._lockstep_spans_device = sorted(self._lockstep_axis_numbers) == list(
+                range(1, self.axis.device.axis_count + 1)
+            )
+            self._get_axes_setting = self.get_setting_from_lockstep_axes
+            self._set_axes_setting = self.set_lockstep_axes_setting
+            self._get_min_axes_setting = self._min_setting_across_lockstep
         else:
             self._primary_axis = self.axis
+            # A single axis behaves like a lockstep group of one for checks across all axes
+            self._lockstep_axes = [self.axis]
+            self._lockstep_spans_device = False
+            self._get_axes_setting = self._get_axis_setting
+            self._set_axes_setting = self._set_axis_setting
+            self._get_min_axes_setting = self._primary_axis.settings.get
 
         self.shaper = ZeroVibrationShaper(plant)
 
+        # Conversions between native units and mm are linear, so look up the scale factors once
+        # instead of calling into the library for every conversion on every move.
+        self._mm_per_native: dict[str, tuple[Units, float]] = {
+            setting: (
+                mm_unit,
+                self._primary_axis.settings.convert_from_native_units(setting, 1, mm_unit),
+            )
+            for setting, mm_unit in (
+                ("pos", _U_MM),
+                ("accel", _U_MMPS2),
+                ("maxspeed", _U_MMPS),
+            )
+        }
+
         self._max_speed_limit = -1.0
 
+        # Axes stay homed until something outside this class unhomes them, so once homing has been
+        # confirmed there's no need to ask the device again.
+        self._homed_cached = False
+
+        # Target of the last shaped move in native units, or None if it isn't known
+        self._last_commanded_native: float | None = None
+
         # Grab the current deceleration so we can reset it back to this value later if we want.
-        if isinstance(self.axis, Lockstep):
-            self._original_deceleration = self.get_setting_from_lockstep_axes(
-                "motion.decelonly", Units.NATIVE
-            )
-        else:
-            self._original_deceleration = [self.axis.settings.get("motion.decelonly", Units.NATIVE)]
+        self._original_deceleration = self._get_axes_setting("motion.decelonly", _U_NATIVE)
+        # Only this class changes the deceleration, so keep track of it rather than reading it back
+        self._deceleration = min(self._original_deceleration)
+
+        # The travel limits don't change at runtime, so read them once rather than on every move
+        self._limit_max = self._get_axes_setting("limit.max", _U_NATIVE)
+        self._limit_min = self._get_axes_setting("limit.min", _U_NATIVE)
 
         # Set the speed limit to the device's current maxspeed so it will never be exceeded
         self.reset_max_speed_limit()
@@ -74,9 +141,7 @@ class ShapedAxis:
         :param unit: The value will be returned in these units.
         :return: The velocity limit.
         """
-        return self._primary_axis.settings.convert_from_native_units(
-            "maxspeed", self._max_speed_limit, unit
-        )
+        return self._convert_from_native_units("maxspeed", self._max_speed_limit, unit)
 
     def set_max_speed_limit(self, value: float, unit: Units = Units.NATIVE) -> None:
         """
@@ -85,36 +150,85 @@ class ShapedAxis:
         :param value: The velocity limit.
         :param unit: The units of the velocity limit value.
         """
-        self._max_speed_limit = self._primary_axis.settings.convert_to_native_units(
-            "maxspeed", value, unit
-        )
+        self._max_speed_limit = self._convert_to_native_units("maxspeed", value, unit)
 
     def reset_max_speed_limit(self) -> None:
         """Reset the velocity limit for shaped moves to the device's existing maxspeed setting."""
-        if isinstance(self.axis, Lockstep):
-            self.set_max_speed_limit(min(self.get_setting_from_lockstep_axes("maxspeed")))
-        else:
-            self.set_max_speed_limit(self.axis.settings.get("maxspeed"))
+        self.set_max_speed_limit(self._get_min_axes_setting("maxspeed", _U_NATIVE))
 
     def reset_deceleration(self) -> None:
         """Reset the trajectory deceleration to the value stored when the class was created."""
-        if isinstance(self.axis, Lockstep):
-            self.set_lockstep_axes_setting(
-                "motion.decelonly", self._original_deceleration, Units.NATIVE
-            )
-        else:
-            self.axis.settings.set("motion.decelonly", self._original_deceleration[0], Units.NATIVE)
+        self._set_axes_setting("motion.decelonly", self._original_deceleration, _U_NATIVE)
+        self._deceleration = min(self._original_deceleration)
 
     def is_homed(self) -> bool:
-        """Check if all axes in lockstep group are homed."""
-        if isinstance(self.axis, Lockstep):
-            for axis in self._lockstep_axes:
-                if not axis.is_homed():
-                    return False
-        else:
-            if not self.axis.is_homed():
-                return False
-        return True
+        """
+        Check if all axes in lockstep group are homed.
+
+        Once the axes are found to be homed the result is cached. Call invalidate_homed_cache() if
+        the axes may have been unhomed by other commands.
+        """
+        if not self._homed_cached:
+            self._homed_cached = all(axis.is_homed() for axis in self._lockstep_axes)
+        return self._homed_cached
+
+    def invalidate_homed_cache(self) -> None:
+        """Make the next call to is_homed() check the device again."""
+        self._homed_cached = False
+
+    def _convert_to_native_units(self, setting: str, value: float, unit: Units) -> float:
+        """
+        Convert a setting value to native units, using the cached scale factor where possible.
+
+        :param setting: The name of the setting whose dimension the value has.
+        :param value: The value to convert.
+        :param unit: The units of the value.
+        :return: The value in native units.
+        """
+        if unit == _U_NATIVE:
+            return value
+        mm_unit, mm_per_native = self._mm_per_native[setting]
+        if unit == mm_unit:
+            return value / mm_per_native
+        return self._primary_axis.settings.convert_to_native_units(setting, value, unit)
+
+    def _convert_from_native_units(self, setting: str, value: float, unit: Units) -> float:
+        """
+        Convert a setting value from native units, using the cached scale factor where possible.
+
+        :param setting: The name of the setting whose dimension the value has.
+        :param value: The value in native units.
+        :param unit: The units to convert the value to.
+        :return: The converted value.
+        """
+        if unit == _U_NATIVE:
+            return value
+        mm_unit, mm_per_native = self._mm_per_native[setting]
+        if unit == mm_unit:
+            return value * mm_per_native
+        return self._primary_axis.settings.convert_from_native_units(setting, value, unit)
+
+    def _get_axis_setting(self, setting: str, unit: Units = Units.NATIVE) -> list[float]:
+        """
+        Get a setting value from a single axis, in the same form as for a lockstep group.
+
+        :param setting: The name of setting
+        :param unit: The value will be returned in these units.
+        :return: A list containing the setting value
+        """
+        return [self._primary_axis.settings.get(setting, unit)]
+
+    def _set_axis_setting(
+        self, setting: str, values: list[float], unit: Units = Units.NATIVE
+    ) -> None:
+        """
+        Set a setting on a single axis, in the same form as for a lockstep group.
+
+        :param setting: The name of setting
+        :param values: A list containing the value to apply
+        :param unit: The units of the value.
+        """
+        self._primary_axis.settings.set(setting, values[0], unit)
 
     def get_setting_from_lockstep_axes(
         self, setting: str, unit: Units = Units.NATIVE
@@ -126,10 +240,25 @@ class ShapedAxis:
         :param unit: The values will be returned in these units.
         :return: A list of setting values
         """
-        values = []
-        for axis in self._lockstep_axes:
-            values.append(axis.settings.get(setting, unit))
-        return values
+        if len(self._lockstep_axes) == 1:
+            return [self._lockstep_axes[0].settings.get(setting, unit)]
+        # Read all axes at once, which takes as few device requests as possible
+        (result,) = self.axis.device.settings.get_many(
+            GetSetting(setting, self._lockstep_axis_numbers, unit)
+        )
+        return result.values
+
+    def _min_setting_across_lockstep(self, setting: str, unit: Units = Units.NATIVE) -> float:
+        """
+        Get the smallest value of a setting across the axes in the lockstep group.
+
+        :param setting: The name of setting
+        :param unit: The value will be returned in these units.
+        :return: The minimum setting value
+        """
+        if len(self._lockstep_axes) == 1:
+            return self._primary_axis.settings.get(setting, unit)
+        return min(self.get_setting_from_lockstep_axes(setting, unit))
 
     def set_lockstep_axes_setting(
         self, setting: str, values: list[float], unit: Units = Units.NATIVE
@@ -142,17 +271,25 @@ class ShapedAxis:
         apply to all
         :param unit: The values will be returned in these units.
         """
-        if len(values) > 1:
-            if len(values) != len(self._lockstep_axes):
-                raise ValueError(
-                    "Length of setting values does not match the number of axes. "
-                    "The list must either be a single value or match the number of axes."
-                )
-            for n, axis in enumerate(self._lockstep_axes):
-                axis.settings.set(setting, values[n], unit)
-        else:
-            for n, axis in enumerate(self._lockstep_axes):
+        if len(values) > 1 and len(values) != len(self._lockstep_axes):
+            raise ValueError(
+                "Length of setting values does not match the number of axes. "
+                "The list must either be a single value or match the number of axes."
+            )
+
+        if (
+            self._lockstep_spans_device
+            and unit == _U_NATIVE
+            and all(value == values[0] for value in values)
+        ):
+            # Every axis on the device gets the same value, so set them all with one request
+            self.axis.device.settings.set(setting, values[0], unit)
+        elif len(values) == 1:
+            for axis in self._lockstep_axes:
                 axis.settings.set(setting, values[0], unit)
+        else:
+            for axis, value in zip(self._lockstep_axes, values):
+                axis.settings.set(setting, value, unit)
 
     def get_lockstep_axes_positions(self, unit: Units = Units.NATIVE) -> list[float]:
         """
@@ -161,10 +298,7 @@ class ShapedAxis:
         :param unit: The positions will be returned in these units.
         :return: A list of setting values
         """
-        positions = []
-        for axis in self._lockstep_axes:
-            positions.append(axis.get_position(unit))
-        return positions
+        return self.get_setting_from_lockstep_axes("pos", unit)
 
     def move_relative(
         self,
@@ -184,62 +318,56 @@ class ShapedAxis:
         :param acceleration_unit: The units for the acceleration value.
         """
         # Convert all to values to the same units
-        position_native = self._primary_axis.settings.convert_to_native_units("pos", position, unit)
-        accel_native = self._primary_axis.settings.convert_to_native_units(
-            "accel", acceleration, acceleration_unit
-        )
+        position_native = self._convert_to_native_units("pos", position, unit)
+        accel_native = self._convert_to_native_units("accel", acceleration, acceleration_unit)
+
+        if round(position_native) == 0:
+            # The move would not change the position, so skip shaping it and talking to the device
+            if wait_until_idle:
+                self.axis.wait_until_idle()
+            return
 
         if acceleration == 0:  # Get the acceleration if it wasn't specified
-            if isinstance(self.axis, Lockstep):
-                accel_native = min(self.get_setting_from_lockstep_axes("accel", Units.NATIVE))
-            else:
-                accel_native = self.axis.settings.get("accel", Units.NATIVE)
+            accel_native = self._get_min_axes_setting("accel", _U_NATIVE)
 
-        position_mm = self._primary_axis.settings.convert_from_native_units(
-            "pos", position_native, Units.LENGTH_MILLIMETRES
-        )
-        accel_mm = self._primary_axis.settings.convert_from_native_units(
-            "accel", accel_native, Units.ACCELERATION_MILLIMETRES_PER_SECOND_SQUARED
-        )
+        position_mm = self._convert_from_native_units("pos", position_native, _U_MM)
+        accel_mm = self._convert_from_native_units("accel", accel_native, _U_MMPS2)
 
         # Apply the input shaping with all values of the same units
         deceleration_mm, max_speed_mm = self.shaper.shape_trapezoidal_motion(
             position_mm,
             accel_mm,
-            self.get_max_speed_limit(Units.VELOCITY_MILLIMETRES_PER_SECOND),
+            self.get_max_speed_limit(_U_MMPS),
         )
 
-        # Check if the target deceleration is different from the current value
-        deceleration_native = round(
-            self._primary_axis.settings.convert_to_native_units(
-                "accel", deceleration_mm, Units.ACCELERATION_MILLIMETRES_PER_SECOND_SQUARED
-            )
+        # Check if the target deceleration is meaningfully different from the current value
+        deceleration_native = max(
+            1,
+            round(self._convert_to_native_units("accel", deceleration_mm, _U_MMPS2)),
         )
 
-        if isinstance(self.axis, Lockstep):
-            if (
-                min(self.get_setting_from_lockstep_axes("motion.decelonly", Units.NATIVE))
-                != deceleration_native
-            ):
-                self.set_lockstep_axes_setting(
-                    "motion.decelonly", [max(1, deceleration_native)], Units.NATIVE
-                )
-        else:
-            if self.axis.settings.get("motion.decelonly", Units.NATIVE) != deceleration_native:
-                self.axis.settings.set(
-                    "motion.decelonly", max(1, deceleration_native), Units.NATIVE
-                )
+        if abs(self._deceleration - deceleration_native) > DECEL_DEADBAND_NATIVE:
+            self._set_axes_setting("motion.decelonly", [deceleration_native], _U_NATIVE)
+            self._deceleration = deceleration_native
 
         # Perform the move
-        self.axis.move_relative(
-            position,
-            unit,
-            wait_until_idle,
-            max_speed_mm,
-            Units.VELOCITY_MILLIMETRES_PER_SECOND,
-            accel_mm,
-            Units.ACCELERATION_MILLIMETRES_PER_SECOND_SQUARED,
-        )
+        try:
+            self.axis.move_relative(
+                position,
+                unit,
+                wait_until_idle,
+                max_speed_mm,
+                _U_MMPS,
+                accel_mm,
+                _U_MMPS2,
+            )
+        except MotionLibException:
+            # The axis may not have reached the target, so the next cached move must query it
+            self._last_commanded_native = None
+            raise
+
+        if self._last_commanded_native is not None:
+            self._last_commanded_native += round(position_native)
 
     def move_absolute(
         self,
@@ -248,6 +376,8 @@ class ShapedAxis:
         wait_until_idle: bool = True,
         acceleration: float = 0,
         acceleration_unit: Units = Units.NATIVE,
+        *,
+        current_position: float | None = None,
     ) -> None:
         """
         Input-shaped absolute move for the target resonant frequency and damping ratio.
@@ -257,11 +387,50 @@ class ShapedAxis:
         :param wait_until_idle: If true the command will hang until the device reaches idle state.
         :param acceleration: The acceleration for the move.
         :param acceleration_unit: The units for the acceleration value.
+        :param current_position: The current position in the same units as position, if already
+        known. If not specified, the position is read from the device.
         """
-        current_position = self.axis.get_position(unit)
+        if current_position is None:
+            current_position = self.axis.get_position(unit)
         self.move_relative(
             position - current_position, unit, wait_until_idle, acceleration, acceleration_unit
         )
+        self._last_commanded_native = round(self._convert_to_native_units("pos", position, unit))
+
+    def move_absolute_cached(
+        self,
+        position: float,
+        unit: Units = Units.NATIVE,
+        wait_until_idle: bool = True,
+        acceleration: float = 0,
+        acceleration_unit: Units = Units.NATIVE,
+    ) -> None:
+        """
+        Input-shaped absolute move starting from the target of the last shaped move.
+
+        This avoids reading the position from the device, so it is only valid if nothing else has
+        moved the axis since the last shaped move. If no target is known, because there has been no
+        absolute move yet or the last move failed, the position is read from the device instead.
+
+        :param position: The position to move to.
+        :param unit: The units for the position value.
+        :param wait_until_idle: If true the command will hang until the device reaches idle state.
+        :param acceleration: The acceleration for the move.
+        :param acceleration_unit: The units for the acceleration value.
+        """
+        current_position = None
+        if self._last_commanded_native is not None:
+            current_position = self._convert_from_native_units(
+                "pos", self._last_commanded_native, unit
+            )
+        self.move_absolute(
+            position,
+            unit,
+            wait_until_idle,
+            acceleration,
+            acceleration_unit,
+            current_position=current_position,
+        )
 
     def move_max(
         self,
@@ -276,18 +445,14 @@ class ShapedAxis:
         :param acceleration: The acceleration for the move.
         :param acceleration_unit: The units for the acceleration value.
         """
-        if isinstance(self.axis, Lockstep):
-            current_axis_positions = self.get_lockstep_axes_positions(Units.NATIVE)
-            end_positions = self.get_setting_from_lockstep_axes("limit.max", Units.NATIVE)
-            # Move will be positive so find min relative move
-            largest_possible_move = np.min(np.subtract(end_positions, current_axis_positions))
-        else:
-            current_position = self.axis.get_position(Units.NATIVE)
-            end_position = self.axis.settings.get("limit.max", Units.NATIVE)
-            largest_possible_move = end_position - current_position
+        current_axis_positions = self._get_axes_setting("pos", _U_NATIVE)
+        # Move will be positive so find min relative move
+        largest_possible_move = min(
+            limit - position for limit, position in zip(self._limit_max, current_axis_positions)
+        )
 
         self.move_relative(
-            largest_possible_move, Units.NATIVE, wait_until_idle, acceleration, acceleration_unit
+            largest_possible_move, _U_NATIVE, wait_until_idle, acceleration, acceleration_unit
         )
 
     def move_min(
@@ -303,15 +468,11 @@ class ShapedAxis:
         :param acceleration: The acceleration for the move.
         :param acceleration_unit: The units for the acceleration value.
         """
-        if isinstance(self.axis, Lockstep):
-            current_axis_positions = self.get_lockstep_axes_positions(Units.NATIVE)
-            end_positions = self.get_setting_from_lockstep_axes("limit.min", Units.NATIVE)
-            # Move will be negative so find max relative move
-            largest_possible_move = np.max(np.subtract(end_positions, current_axis_positions))
-        else:
-            current_position = self.axis.get_position(Units.NATIVE)
-            end_position = self.axis.settings.get("limit.min", Units.NATIVE)
-            largest_possible_move = end_position - current_position
+        current_axis_positions = self._get_axes_setting("pos", _U_NATIVE)
+        # Move will be negative so find max relative move
+        largest_possible_move = max(
+            limit - position for limit, position in zip(self._limit_min, current_axis_positions)
+        )
         self.move_relative(
-            largest_possible_move, Units.NATIVE, wait_until_idle, acceleration, acceleration_unit
+            largest_possible_move, _U_NATIVE, wait_until_idle, acceleration, acceleration_unit
         )
@@ -4,18 +4,52 @@ This file contains the ShapedAxisStream class, which is to be re-used in your co
 Run the file directly to test the class out with a Zaber Device.
 """
 
-# pylint: disable=too-many-arguments
+# pylint: disable=too-many-arguments, too-many-instance-attributes, too-many-locals
+# pylint: disable=too-many-branches
+
+import asyncio
+import threading
 
 import numpy as np
+from numpy.typing import NDArray
 from zaber_motion import Units, Measurement
-from zaber_motion.ascii import Axis, Lockstep, StreamAxisDefinition, StreamAxisType
+from zaber_motion.ascii import (
+    Axis,
+    Lockstep,
+    StreamAxisDefinition,
+    StreamAxisType,
+    GetSetting,
+    GetAxisSetting,
+)
 from zero_vibration_stream_generator import ZeroVibrationStreamGenerator, ShaperType
 from plant import Plant
 
+# Number of distinct shaped moves to keep generated segments for before the cache is cleared
+SEGMENT_CACHE_SIZE = 64
+
 
 class ShapedAxisStream:
     """A Zaber device axis that performs streamed moves with input shaping vibration reduction."""
 
+    __slots__ = (
+        "axis",
+        "shaper",
+        "stream",
+        "_is_lockstep",
+        "_lockstep_axis_numbers",
+        "_lockstep_axes",
+        "_primary_axis",
+        "_lockstep_stream_axis",
+        "_settings",
+        "_max_speed_limit",
+        "_stream_configured",
+        "_segment_cache",
+        "_move_lock",
+        "_mm_per_native",
+        "_accel_1native_mm",
+        "_speed_1native_mm",
+    )
+
     def __init__(
         self,
         zaber_axis: Axis | Lockstep,
@@ -31,36 +65,68 @@ class ShapedAxisStream:
         :shaper_type: Type of input shaper to use
         :stream_id: Stream number on device to use to perform moves
         """
+        if zaber_axis is None:
+            raise TypeError("No Axis or Lockstep was used to initialize ShapedAxisStream.")
         if isinstance(zaber_axis, Axis):
             # Sanity check if the passed axis has a higher number than the number of axes on the
+            # device. The axis count comes from the device identity, so this doesn't query the
             # device.
-            if zaber_axis.axis_number > zaber_axis.device.axis_count or zaber_axis is None:
+            if zaber_axis.axis_number > zaber_axis.device.axis_count:
                 raise TypeError("Invalid Axis class was used to initialized ShapedAxisStream.")
-        elif isinstance(zaber_axis, Lockstep):
-            # Sanity check if the passed lockstep group number exceeds than the number of
-            # lockstep groups on the device.
-            if (
-                zaber_axis.lockstep_group_id > zaber_axis.device.settings.get("lockstep.numgroups")
-                or zaber_axis is None
-            ):
-                raise TypeError("Invalid Lockstep class was used to initialized ShapedAxisStream.")
+        # An invalid lockstep group is reported by the device when its axis numbers are read below,
+        # so it isn't worth an extra request to check the number of lockstep groups here.
 
         self.axis = zaber_axis
 
+        self._is_lockstep = isinstance(self.axis, Lockstep)
         if isinstance(self.axis, Lockstep):
             # Get axis numbers that are used so that settings can be changed
+            self._lockstep_axis_numbers = self.axis.get_axis_numbers()
             self._lockstep_axes = []
-            for axis_number in self.axis.get_axis_numbers():
+            for axis_number in self._lockstep_axis_numbers:
                 self._lockstep_axes.append(self.axis.device.get_axis(axis_number))
             self._primary_axis = self._lockstep_axes[0]
+            self._lockstep_stream_axis = StreamAxisDefinition(
+                self.axis.lockstep_group_id, StreamAxisType.LOCKSTEP
+            )
         else:
             self._primary_axis = self.axis
+        # Unit conversions all go through the primary axis, so keep its settings object at hand
+        self._settings = self._primary_axis.settings
 
         self.shaper = ZeroVibrationStreamGenerator(plant, shaper_type)
         self.stream = zaber_axis.device.streams.get_stream(stream_id)
 
         self._max_speed_limit = -1.0
 
+        # The stream stays set up in live mode between moves, so it only needs to be configured
+        # again if the previous move was not confirmed to have completed without a fault.
+        self._stream_configured = False
+
+        self._move_lock = threading.Lock()
+
+        # Segment arrays from recent moves, keyed by everything the shaper output depends on
+        self._segment_cache: dict[
+            tuple[float, float, float, float, ShaperType, float, float],
+            tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]],
+        ] = {}
+
+        # Conversions between native units and mm are linear, so look up the scale factors once
+        # instead of calling into the library for every conversion on every move.
+        self._mm_per_native: dict[str, tuple[Units, float]] = {
+            setting: (mm_unit, self._settings.convert_from_native_units(setting, 1, mm_unit))
+            for setting, mm_unit in (
+                ("pos", Units.LENGTH_MILLIMETRES),
+                ("accel", Units.ACCELERATION_MILLIMETRES_PER_SECOND_SQUARED),
+                ("maxspeed", Units.VELOCITY_MILLIMETRES_PER_SECOND),
+            )
+        }
+
+        # Smallest non-zero acceleration and speed the device can represent, in the units used by
+        # the stream segments. Used to keep segment values from rounding down to zero.
+        self._accel_1native_mm = self._mm_per_native["accel"][1]
+        self._speed_1native_mm = self._mm_per_native["maxspeed"][1]
+
         # Set the speed limit to the device's current maxspeed so it will never be exceeded
         self.reset_max_speed_limit()
 
@@ -71,9 +137,7 @@ class ShapedAxisStream:
         :param unit: The value will be returned in these units.
         :return: The velocity limit.
         """
-        return self._primary_axis.settings.convert_from_native_units(
-            "maxspeed", self._max_speed_limit, unit
-        )
+        return self._convert_from_native_units("maxspeed", self._max_speed_limit, unit)
 
     def set_max_speed_limit(self, value: float, unit: Units = Units.NATIVE) -> None:
         """
@@ -82,27 +146,55 @@ class ShapedAxisStream:
         :param value: The velocity limit.
         :param unit: The units of the velocity limit value.
         """
-        self._max_speed_limit = self._primary_axis.settings.convert_to_native_units(
-            "maxspeed", value, unit
-        )
+        self._max_speed_limit = self._convert_to_native_units("maxspeed", value, unit)
 
     def reset_max_speed_limit(self) -> None:
         """Reset the velocity limit for shaped moves to the device's existing maxspeed setting."""
-        if isinstance(self.axis, Lockstep):
+        if self._is_lockstep:
             self.set_max_speed_limit(min(self.get_setting_from_lockstep_axes("maxspeed")))
         else:
-            self.set_max_speed_limit(self.axis.settings.get("maxspeed"))
+            self.set_max_speed_limit(self._settings.get("maxspeed"))
+
+    def reset_stream(self) -> None:
+        """Force the stream to be disabled and set up again before the next move."""
+        self._stream_configured = False
 
     def is_homed(self) -> bool:
         """Check if all axes in lockstep group are homed."""
-        if isinstance(self.axis, Lockstep):
-            for axis in self._lockstep_axes:
-                if not axis.is_homed():
-                    return False
-        else:
-            if not self.axis.is_homed():
-                return False
-        return True
+        axes = self._lockstep_axes if self._is_lockstep else [self._primary_axis]
+        return all(axis.is_homed() for axis in axes)
+
+    def _convert_to_native_units(self, setting: str, value: float, unit: Units) -> float:
+        """
+        Convert a setting value to native units, using the cached scale factor where possible.
+
+        :param setting: The name of the setting whose dimension the value has.
+        :param value: The value to convert.
+        :param unit: The units of the value.
+        :return: The value in native units.
+        """
+        if unit == Units.NATIVE:
+            return value
+        mm_unit, mm_per_native = self._mm_per_native[setting]
+        if unit == mm_unit:
+            return value / mm_per_native
+        return self._settings.convert_to_native_units(setting, value, unit)
+
+    def _convert_from_native_units(self, setting: str, value: float, unit: Units) -> float:
+        """
+        Convert a setting value from native units, using the cached scale factor where possible.
+
+        :param setting: The name of the setting whose dimension the value has.
+        :param value: The value in native units.
+        :param unit: The units to convert the value to.
+        :return: The converted value.
+        """
+        if unit == Units.NATIVE:
+            return value
+        mm_unit, mm_per_native = self._mm_per_native[setting]
+        if unit == mm_unit:
+            return value * mm_per_native
+        return self._settings.convert_from_native_units(setting, value, unit)
 
     def get_setting_from_lockstep_axes(
         self, setting: str, unit: Units = Units.NATIVE
@@ -114,10 +206,13 @@ class ShapedAxisStream:
         :param unit: The values will be returned in these units.
         :return: A list of setting values
         """
-        values = []
-        for axis in self._lockstep_axes:
-            values.append(axis.settings.get(setting, unit))
-        return values
+        if len(self._lockstep_axes) == 1:
+            return [self._lockstep_axes[0].settings.get(setting, unit)]
+        # Read all axes at once, which takes as few device requests as possible
+        (result,) = self.axis.device.settings.get_many(
+            GetSetting(setting, self._lockstep_axis_numbers, unit)
+        )
+        return result.values
 
     def set_lockstep_axes_setting(
         self, setting: str, values: list[float], unit: Units = Units.NATIVE
@@ -130,17 +225,15 @@ class ShapedAxisStream:
         apply to all
         :param unit: The values will be returned in these units.
         """
-        if len(values) > 1:
-            if len(values) != len(self._lockstep_axes):
-                raise ValueError(
-                    "Length of setting values does not match the number of axes. "
-                    "The list must either be a single value or match the number of axes."
-                )
-            for n, axis in enumerate(self._lockstep_axes):
-                axis.settings.set(setting, values[n], unit)
-        else:
-            for n, axis in enumerate(self._lockstep_axes):
-                axis.settings.set(setting, values[0], unit)
+        if len(values) not in (1, len(self._lockstep_axes)):
+            raise ValueError(
+                "Length of setting values does not match the number of axes. "
+                "The list must either be a single value or match the number of axes."
+            )
+        if len(values) == 1:
+            values = values * len(self._lockstep_axes)
+        for axis, value in zip(self._lockstep_axes, values):
+            axis.settings.set(setting, value, unit)
 
     def get_lockstep_axes_positions(self, unit: Units = Units.NATIVE) -> list[float]:
         """
@@ -149,10 +242,8 @@ class ShapedAxisStream:
         :param unit: The positions will be returned in these units.
         :return: A list of setting values
         """
-        positions = []
-        for axis in self._lockstep_axes:
-            positions.append(axis.get_position(unit))
-        return positions
+        # Position is readable as the "pos" setting, so every axis can be read in one request
+        return self.get_setting_from_lockstep_axes("pos", unit)
 
     def move_relative(
         self,
@@ -171,85 +262,224 @@ class ShapedAxisStream:
         :param acceleration: The acceleration for the move.
         :param acceleration_unit: The units for the acceleration value.
         """
-        # Convert all to values to the same units
-        position_native = self._primary_axis.settings.convert_to_native_units("pos", position, unit)
-        accel_native = self._primary_axis.settings.convert_to_native_units(
-            "accel", acceleration, acceleration_unit
+        self._move_relative_impl(position, unit, wait_until_idle, acceleration, acceleration_unit)
+
+    async def move_relative_async(
+        self,
+        position: float,
+        unit: Units = Units.NATIVE,
+        acceleration: float = 0,
+        acceleration_unit: Units = Units.NATIVE,
+    ) -> None:
+        """
+        Input-shaped relative move that can be awaited until the device reaches idle state.
+
+        The trajectory is generated and sent from a worker thread and waiting for the motion to
+        finish does not block the event loop, so other work can run while the axis is moving.
+        Await each move before starting the next one on the same instance. Moves are not queued
+        behind each other's motion, so overlapping moves are not supported.
+
+        :param position: The amount to move.
+        :param unit: The units for the position value.
+        :param acceleration: The acceleration for the move.
+        :param acceleration_unit: The units for the acceleration value.
+        """
+        queued = await asyncio.to_thread(
+            self._move_relative_impl, position, unit, False, acceleration, acceleration_unit
         )
+        if queued:
+            await self.stream.wait_until_idle_async()
+        else:
+            # Nothing was sent, so the stream may not be set up. Wait on the axis like move_relative
+            await self.axis.wait_until_idle_async()
+
+    def _move_relative_impl(
+        self,
+        position: float,
+        unit: Units,
+        wait_until_idle: bool,
+        acceleration: float,
+        acceleration_unit: Units,
+        *,
+        start_position_mm: float | None = None,
+    ) -> bool:
+        """
+        Perform an input-shaped relative move, optionally from an already known start position.
+
+        Moves are sent one at a time, since the stream and the cached state are shared between
+        moves, including those sent from move_relative_async worker threads.
+
+        :param position: The amount to move.
+        :param unit: The units for the position value.
+        :param wait_until_idle: If true the command will hang until the device reaches idle state.
+        :param acceleration: The acceleration for the move.
+        :param acceleration_unit: The units for the acceleration value.
+        :param start_position_mm: The current position in mm if already known. If not specified,
+        the position is read from the device.
+        :return: True if the move was sent through the stream, False if it was skipped because it
+        would not change the position.
+        """
+        with self._move_lock:
+            return self._send_shaped_move(
+                position,
+                unit,
+                wait_until_idle,
+                acceleration,
+                acceleration_unit,
+                start_position_mm=start_position_mm,
+            )
+
+    def _send_shaped_move(
+        self,
+        position: float,
+        unit: Units,
+        wait_until_idle: bool,
+        acceleration: float,
+        acceleration_unit: Units,
+        *,
+        start_position_mm: float | None = None,
+    ) -> bool:
+        """
+        Shape a relative move and send it through the stream. Must be called with the move lock.
+
+        :param position: The amount to move.
+        :param unit: The units for the position value.
+        :param wait_until_idle: If true the command will hang until the device reaches idle state.
+        :param acceleration: The acceleration for the move.
+        :param acceleration_unit: The units for the acceleration value.
+        :param start_position_mm: The current position in mm if already known. If not specified,
+        the position is read from the device.
+        :return: True if the move was sent through the stream, False if it was skipped.
+        """
+        # Convert all to values to the same units
+        position_native = self._convert_to_native_units("pos", position, unit)
+        accel_native = self._convert_to_native_units("accel", acceleration, acceleration_unit)
         decel_native = accel_native
 
+        if round(position_native) == 0:
+            # The move would not change the position, so skip shaping it and talking to the device
+            if wait_until_idle:
+                self.axis.wait_until_idle()
+            return False
+
         if acceleration == 0:  # Get the acceleration and deceleration if it wasn't specified
-            if isinstance(self.axis, Lockstep):
-                accel_native = min(self.get_setting_from_lockstep_axes("accel", Units.NATIVE))
-                decel_native = min(
-                    self.get_setting_from_lockstep_axes("motion.decelonly", Units.NATIVE)
+            # Read both settings together so it takes as few device requests as possible
+            if self._is_lockstep:
+                accel_result, decel_result = self.axis.device.settings.get_many(
+                    GetSetting("accel", self._lockstep_axis_numbers, Units.NATIVE),
+                    GetSetting("motion.decelonly", self._lockstep_axis_numbers, Units.NATIVE),
                 )
+                accel_native = min(accel_result.values)
+                decel_native = min(decel_result.values)
             else:
-                accel_native = self.axis.settings.get("accel", Units.NATIVE)
-                decel_native = self.axis.settings.get("motion.decelonly", Units.NATIVE)
+                accel_axis_result, decel_axis_result = self._settings.get_many(
+                    GetAxisSetting("accel", Units.NATIVE),
+                    GetAxisSetting("motion.decelonly", Units.NATIVE),
+                )
+                accel_native = accel_axis_result.value
+                decel_native = decel_axis_result.value
 
-        position_mm = self._primary_axis.settings.convert_from_native_units(
+        position_mm = self._convert_from_native_units(
             "pos", position_native, Units.LENGTH_MILLIMETRES
         )
-        accel_mm = self._primary_axis.settings.convert_from_native_units(
+        accel_mm = self._convert_from_native_units(
             "accel", accel_native, Units.ACCELERATION_MILLIMETRES_PER_SECOND_SQUARED
         )
-        decel_mm = self._primary_axis.settings.convert_from_native_units(
+        decel_mm = self._convert_from_native_units(
             "accel", decel_native, Units.ACCELERATION_MILLIMETRES_PER_SECOND_SQUARED
         )
 
-        start_position = self.axis.get_position(Units.LENGTH_MILLIMETRES)
+        if start_position_mm is None:
+            start_position_mm = self.axis.get_position(Units.LENGTH_MILLIMETRES)
 
-        stream_segments = self.shaper.shape_trapezoidal_motion(
+        positions_mm, speed_limits_mm, accels_mm = self._get_shaped_segments(
             position_mm,
             accel_mm,
             decel_mm,
             self.get_max_speed_limit(Units.VELOCITY_MILLIMETRES_PER_SECOND),
         )
 
-        self.stream.disable()
-        if isinstance(self.axis, Lockstep):
-            self.stream.setup_live_composite(
-                StreamAxisDefinition(self.axis.lockstep_group_id, StreamAxisType.LOCKSTEP)
-            )
-        else:
-            self.stream.setup_live(self.axis.axis_number)
+        # Compute every segment's parameters up front so only stream calls happen while corked
+        segment_commands = zip(
+            accels_mm.tolist(),
+            speed_limits_mm.tolist(),
+            [
+                Measurement(end_position, Units.LENGTH_MILLIMETRES)
+                for end_position in (positions_mm + start_position_mm).tolist()
+            ],
+        )
+
+        if not self._stream_configured:
+            self.stream.disable()
+            if self._is_lockstep:
+                self.stream.setup_live_composite(self._lockstep_stream_axis)
+            else:
+                self.stream.setup_live(self._primary_axis.axis_number)
+        # Cleared until the move is known to have completed so that a move that fails or is
+        # interrupted sets the stream up again
+        self._stream_configured = False
         self.stream.cork()
-        for segment in stream_segments:
-            # Set acceleration making sure it is greater than zero by comparing 1 native accel unit
-            if (
-                self._primary_axis.settings.convert_to_native_units(
-                    "accel", segment.accel, Units.ACCELERATION_MILLIMETRES_PER_SECOND_SQUARED
-                )
-                > 1
-            ):
+        # Stream acceleration and speed limits persist between lines, so only send them when they
+        # change from the previous segment
+        current_accel = current_speed = -1.0
+        for segment_accel, segment_speed, segment_end in segment_commands:
+            if segment_accel != current_accel:
                 self.stream.set_max_tangential_acceleration(
-                    segment.accel, Units.ACCELERATION_MILLIMETRES_PER_SECOND_SQUARED
-                )
-            else:
-                self.stream.set_max_tangential_acceleration(1, Units.NATIVE)
-
-            # Set max speed making sure that it is at least 1 native speed unit
-            if (
-                self._primary_axis.settings.convert_to_native_units(
-                    "maxspeed", segment.speed_limit, Units.VELOCITY_MILLIMETRES_PER_SECOND
+                    segment_accel, Units.ACCELERATION_MILLIMETRES_PER_SECOND_SQUARED
                 )
-                > 1
-            ):
-                self.stream.set_max_speed(
-                    segment.speed_limit, Units.VELOCITY_MILLIMETRES_PER_SECOND
-                )
-            else:
-                self.stream.set_max_speed(1, Units.NATIVE)
-
-            # set position for the end of the segment
-            self.stream.line_absolute(
-                Measurement(segment.position + start_position, Units.LENGTH_MILLIMETRES)
-            )
+                current_accel = segment_accel
+            if segment_speed != current_speed:
+                self.stream.set_max_speed(segment_speed, Units.VELOCITY_MILLIMETRES_PER_SECOND)
+                current_speed = segment_speed
+            self.stream.line_absolute(segment_end)
         self.stream.uncork()
 
         if wait_until_idle:
             self.stream.wait_until_idle()
+            # The move finished without a fault, so the stream can be reused as is for the next move
+            self._stream_configured = True
+        return True
+
+    def _get_shaped_segments(
+        self, distance_mm: float, accel_mm: float, decel_mm: float, max_speed_mm: float
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+        """
+        Get the shaped segment positions, speed limits, and accelerations for a move in mm.
+
+        Repeated moves with the same parameters reuse the previously generated arrays. The shaper
+        type and plant are part of the cache key so changing them takes effect on the next move.
+
+        :param distance_mm: The move distance in mm.
+        :param accel_mm: The move acceleration in mm/s^2.
+        :param decel_mm: The move deceleration in mm/s^2.
+        :param max_speed_mm: The move speed limit in mm/s.
+        :return: The segment end positions relative to the start of the move, the segment speed
+        limits, and the segment accelerations.
+        """
+        key = (
+            distance_mm,
+            accel_mm,
+            decel_mm,
+            max_speed_mm,
+            self.shaper.shaper_type,
+            self.shaper.plant.resonant_frequency,
+            self.shaper.plant.damping_ratio,
+        )
+        segments = self._segment_cache.get(key)
+        if segments is None:
+            segments = self.shaper.shape_trapezoidal_motion_arrays(
+                distance_mm,
+                accel_mm,
+                decel_mm,
+                max_speed_mm,
+                # Keep acceleration and max speed at or above 1 native unit so they are never zero
+                min_acceleration=self._accel_1native_mm,
+                min_speed_limit=self._speed_1native_mm,
+            )
+            if len(self._segment_cache) >= SEGMENT_CACHE_SIZE:
+                self._segment_cache.clear()
+            self._segment_cache[key] = segments
+        return segments
 
     def move_absolute(
         self,
@@ -268,9 +498,18 @@ class ShapedAxisStream:
         :param acceleration: The acceleration for the move.
         :param acceleration_unit: The units for the acceleration value.
         """
-        current_position = self.axis.get_position(unit)
-        self.move_relative(
-            position - current_position, unit, wait_until_idle, acceleration, acceleration_unit
+        # Read the position once and use it both for the move distance and as the stream start
+        current_position_native = self.axis.get_position(Units.NATIVE)
+        current_position = self._convert_from_native_units("pos", current_position_native, unit)
+        self._move_relative_impl(
+            position - current_position,
+            unit,
+            wait_until_idle,
+            acceleration,
+            acceleration_unit,
+            start_position_mm=self._convert_from_native_units(
+                "pos", current_position_native, Units.LENGTH_MILLIMETRES
+            ),
         )
 
     def move_max(
@@ -286,18 +525,29 @@ class ShapedAxisStream:
         :param acceleration: The acceleration for the move.
         :param acceleration_unit: The units for the acceleration value.
         """
-        if isinstance(self.axis, Lockstep):
+        if self._is_lockstep:
             current_axis_positions = self.get_lockstep_axes_positions(Units.NATIVE)
             end_positions = self.get_setting_from_lockstep_axes("limit.max", Units.NATIVE)
             # Move will be positive so find min relative move
-            largest_possible_move = np.min(np.subtract(end_positions, current_axis_positions))
+            largest_possible_move = min(
+                end - current for end, current in zip(end_positions, current_axis_positions)
+            )
+            # The lockstep position is the position of its first axis
+            current_position = current_axis_positions[0]
         else:
             current_position = self.axis.get_position(Units.NATIVE)
-            end_position = self.axis.settings.get("limit.max", Units.NATIVE)
+            end_position = self._settings.get("limit.max", Units.NATIVE)
             largest_possible_move = end_position - current_position
 
-        self.move_relative(
-            largest_possible_move, Units.NATIVE, wait_until_idle, acceleration, acceleration_unit
+        self._move_relative_impl(
+            largest_possible_move,
+            Units.NATIVE,
+            wait_until_idle,
+            acceleration,
+            acceleration_unit,
+            start_position_mm=self._convert_from_native_units(
+                "pos", current_position, Units.LENGTH_MILLIMETRES
+            ),
         )
 
     def move_min(
@@ -313,15 +563,26 @@ class ShapedAxisStream:
         :param acceleration: The acceleration for the move.
         :param acceleration_unit: The units for the acceleration value.
         """
-        if isinstance(self.axis, Lockstep):
+        if self._is_lockstep:
             current_axis_positions = self.get_lockstep_axes_positions(Units.NATIVE)
             end_positions = self.get_setting_from_lockstep_axes("limit.min", Units.NATIVE)
             # Move will be negative so find max relative move
-            largest_possible_move = np.max(np.subtract(end_positions, current_axis_positions))
+            largest_possible_move = max(
+                end - current for end, current in zip(end_positions, current_axis_positions)
+            )
+            # The lockstep position is the position of its first axis
+            current_position = current_axis_positions[0]
         else:
             current_position = self.axis.get_position(Units.NATIVE)
-            end_position = self.axis.settings.get("limit.min", Units.NATIVE)
+            end_position = self._settings.get("limit.min", Units.NATIVE)
             largest_possible_move = end_position - current_position
-        self.move_relative(
-            largest_possible_move, Units.NATIVE, wait_until_idle, acceleration, acceleration_unit
+        self._move_relative_impl(
+            largest_possible_move,
+            Units.NATIVE,
+            wait_until_idle,
+            acceleration,
+            acceleration_unit,
+            start_position_mm=self._convert_from_native_units(
+                "pos", current_position, Units.LENGTH_MILLIMETRES
+            ),
         )
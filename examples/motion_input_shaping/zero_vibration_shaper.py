@@ -8,7 +8,6 @@ Run the file directly to test the class functionality.
 # Allow short variable names
 
 import math
-import numpy as np
 from plant import Plant
 
 
@@ -23,18 +22,40 @@ class ZeroVibrationShaper:
         """
         self.plant = plant
         self._n = 1  # How many periods to wait before starting deceleration.
+        self._plant_key = (0.0, 0.0)
+        self._resonant_period = 0.0
+        self._decay_per_period = 0.0
+        self.precompute()
 
     @property
     def n(self) -> int:
         """Get the number of vibration periods to wait before starting deceleration."""
         return self._n
 
+    def precompute(self) -> None:
+        """
+        Compute the impulse constants that only depend on the plant.
+
+        This is called automatically on construction and whenever the plant parameters change, so
+        each move only needs a few multiplications to get the impulse times and amplitudes.
+        """
+        damping_ratio = self.plant.damping_ratio
+        self._plant_key = (self.plant.resonant_frequency, damping_ratio)
+        self._resonant_period = self.plant.resonant_period
+        # Ratio of the second impulse to the first when waiting a single period
+        self._decay_per_period = math.exp(
+            (-2 * math.pi * damping_ratio) / math.sqrt(1 - damping_ratio**2)
+        )
+
+    def _check_plant(self) -> None:
+        """Recompute the cached impulse constants if the plant has been modified."""
+        if self._plant_key != (self.plant.resonant_frequency, self.plant.damping_ratio):
+            self.precompute()
+
     def get_impulse_amplitudes(self) -> list[float]:
         """Get the unitless magnitude of both impulses to perform the input shaping."""
-        k = math.exp(
-            (-2 * math.pi * self._n * self.plant.damping_ratio)
-            / math.sqrt(1 - self.plant.damping_ratio**2)
-        )
+        self._check_plant()
+        k = self._decay_per_period**self._n
 
         a1 = 1 / (1 + k)
         a2 = k / (1 + k)
@@ -43,7 +64,8 @@ class ZeroVibrationShaper:
 
     def get_impulse_times(self) -> list[float]:
         """Get the time of both impulses to perform the input shaping in seconds."""
-        return [0, self.plant.resonant_period * self._n]
+        self._check_plant()
+        return [0, self._resonant_period * self._n]
 
     def get_minimum_acceleration(self, distance: float) -> float:
         """
@@ -85,11 +107,10 @@ class ZeroVibrationShaper:
         b = -1 * t1
         c = distance
 
-        # Special case when acceleration is equal to deceleration (no damping)
-        if a == 0:
-            return distance / t1
-
-        return float(max(np.roots([a, b, c])))
+        # Deceleration never exceeds acceleration, so a <= 0 and the quadratic always has one
+        # non-negative root. This form of the quadratic formula avoids cancellation when a is
+        # small and reduces to distance / t1 when acceleration equals deceleration (no damping).
+        return 2 * c / (-b + math.sqrt(b**2 - 4 * a * c))
 
     def calculate_n(self, distance: float, acceleration: float, max_speed_limit: float = -1) -> int:
         """
@@ -8,6 +8,7 @@ import math
 from enum import Enum
 from dataclasses import dataclass
 import numpy as np
+from numpy.typing import NDArray
 from plant import Plant
 
 
@@ -88,6 +89,38 @@ def trapezoidal_motion_generator(
     ]
 
 
+def convolve_acceleration_steps(
+    impulse_times: list[float],
+    impulses: list[float],
+    unshaped_time: NDArray[np.float64],
+    unshaped_acceleration: NDArray[np.float64],
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """
+    Convolve a step-change acceleration profile with the shaper impulses.
+
+    Array form of calculate_acceleration_convolution. Returns the shaped times and accelerations.
+
+    :param impulse_times: List of shaper impulse times
+    :param impulses: List of shaper impulse magnitudes
+    :param unshaped_time: Times of the acceleration changes
+    :param unshaped_acceleration: Acceleration starting at each of the times
+    """
+    # prepend a 0 to the accelerations and take diff to get changes
+    unshaped_accel_changes = np.diff(unshaped_acceleration, prepend=0.0)
+
+    # for each impulse create a copy of the acceleration changes delayed and scaled by the
+    # impulse time and magnitude, one impulse per row
+    shaped_time = (np.array(impulse_times)[:, np.newaxis] + unshaped_time).ravel()
+    accel_changes = (unshaped_accel_changes * np.array(impulses)[:, np.newaxis]).ravel()
+
+    # sort acceleration changes by time
+    sort_index = shaped_time.argsort()
+
+    # Final trajectory acceleration is cumulative sum of acceleration steps which gives the
+    # superposition of the contribution from each impulse and is equivalent to the convolution
+    return shaped_time[sort_index], np.cumsum(accel_changes[sort_index])
+
+
 def calculate_acceleration_convolution(
     impulse_times: list[float],
     impulses: list[float],
@@ -106,35 +139,12 @@ def calculate_acceleration_convolution(
     :param impulses: List of shaper impulse magnitudes
     :param unshaped_trajectory: List of acceleration points
     """
-    unshaped_time = [x.time for x in unshaped_trajectory]
-    unshaped_acceleration = [x.acceleration for x in unshaped_trajectory]
-
-    unshaped_accel_changes = np.diff(
-        np.concatenate([np.array([0]), np.array(unshaped_acceleration)])
-    )  # append a 0 to start of list of accelerations and take diff to get changes
-    num_rows = len(unshaped_acceleration)
-
-    # Create extra points based on number of impulses
-    shaped_time = np.zeros(len(unshaped_acceleration) * len(impulses))
-    accel_changes = np.zeros(len(unshaped_acceleration) * len(impulses))
-    # for each impulse create a copy of the acceleration change delayed and scaled by the
-    # impulse time and magnitude
-    for n, impulse in enumerate(impulses):
-        shaped_time[n * num_rows : (num_rows + n * num_rows)] = (
-            np.array([unshaped_time]) + impulse_times[n]
-        )
-        accel_changes[n * num_rows : (num_rows + n * num_rows)] = (
-            np.array([unshaped_accel_changes]) * impulse
-        )
-
-    # sort acceleration changes by time
-    sort_index = shaped_time.argsort()
-    shaped_time = shaped_time[sort_index]
-    accel_changes = accel_changes[sort_index]
-
-    # Final trajectory acceleration is cumulative sum of acceleration steps which gives the
-    # superposition of the contribution from each impulse and is equivalent to the convolution
-    shaped_acceleration = np.cumsum(accel_changes)  # Acceleration
+    shaped_time, shaped_acceleration = convolve_acceleration_steps(
+        impulse_times,
+        impulses,
+        np.array([x.time for x in unshaped_trajectory], dtype=np.float64),
+        np.array([x.acceleration for x in unshaped_trajectory], dtype=np.float64),
+    )
 
     shaped_trajectory = []
     for n, accel in enumerate(shaped_acceleration):
@@ -186,6 +196,32 @@ def create_stream_trajectory(trajectory: list[AccelPoint]) -> list[StreamSegment
     return stream_segments
 
 
+def create_stream_trajectory_arrays(
+    trajectory_time: NDArray[np.float64], trajectory_acceleration: NDArray[np.float64]
+) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+    """
+    Compute information needed to execute trajectory through streams as arrays.
+
+    Same as create_stream_trajectory, but takes the trajectory as arrays and returns the segment
+    end positions, speed limits, and accelerations as separate arrays computed in one pass instead
+    of a list of StreamSegment. The final acceleration must be 0.
+
+    :param trajectory_time: Times of the acceleration changes
+    :param trajectory_acceleration: Acceleration starting at each of the times
+    """
+    # The last acceleration only applies after the final point so it doesn't form a segment
+    segment_acceleration = trajectory_acceleration[:-1]
+    dt = np.diff(trajectory_time)
+
+    # Velocity and position at segment boundaries using equations for constant acceleration,
+    # starting from rest at zero
+    velocity = np.concatenate(([0.0], np.cumsum(segment_acceleration * dt)))
+    positions = np.cumsum((velocity[1:] + velocity[:-1]) / 2 * dt)
+    speed_limits = np.maximum(np.abs(velocity[1:]), np.abs(velocity[:-1]))
+
+    return positions, speed_limits, np.abs(segment_acceleration)
+
+
 class ZeroVibrationStreamGenerator:
     """A class for creating stream motion with zero vibration input shaping theory."""
 
@@ -287,6 +323,56 @@ class ZeroVibrationStreamGenerator:
 
         return stream_segments
 
+    def shape_trapezoidal_motion_arrays(  # pylint: disable=too-many-arguments
+        self,
+        distance: float,
+        acceleration: float,
+        deceleration: float,
+        max_speed_limit: float,
+        *,
+        min_acceleration: float = 0,
+        min_speed_limit: float = 0,
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+        """
+        Create stream points for zero vibration trapezoidal motion as arrays.
+
+        Same as shape_trapezoidal_motion, but returns the segment end positions, speed limits, and
+        accelerations as separate arrays. All distance, speed, and accel units must be consistent.
+
+        :param distance: The trajectory distance.
+        :param acceleration: The trajectory acceleration.
+        :param deceleration: The trajectory deceleration.
+        :param max_speed_limit: An optional limit to place on maximum trajectory speed in the
+        output motion.
+        :param min_acceleration: Segment accelerations are raised to at least this value.
+        :param min_speed_limit: Segment speed limits are raised to at least this value.
+        """
+        unshaped_trajectory = trapezoidal_motion_generator(
+            distance,
+            acceleration,
+            deceleration,
+            max_speed_limit,
+        )
+
+        shaped_time, shaped_acceleration = convolve_acceleration_steps(
+            self.get_impulse_times(),
+            self.get_impulse_amplitudes(),
+            np.array([x.time for x in unshaped_trajectory], dtype=np.float64),
+            np.array([x.acceleration for x in unshaped_trajectory], dtype=np.float64),
+        )
+
+        positions, speed_limits, accelerations = create_stream_trajectory_arrays(
+            shaped_time, shaped_acceleration
+        )
+
+        # make sure end point position is exactly on target
+        positions[-1] = distance
+
+        np.maximum(accelerations, min_acceleration, out=accelerations)
+        np.maximum(speed_limits, min_speed_limit, out=speed_limits)
+
+        return positions, speed_limits, accelerations
+
 
 # Example code for using the class.
 if __name__ == "__main__":